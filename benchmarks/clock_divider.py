@@ -0,0 +1,86 @@
+"""Benchmark of SNU layers running at a divided clock on the MNIST and JSB examples: training time,
+test accuracy/loss and the number of SNU cell evaluations relative to the undivided network.
+
+MNIST: the first SNU layer ticks at the input rate, the deeper SNU layers at 1/k of it.
+JSB: the next-step prediction combines a full-rate SNU layer with a deeper SNU layer at 1/k of the rate,
+whose output is upsampled and delayed by k - 1 steps, so that the predictions remain causal.
+The decay of the divided layers is decay ** k, which keeps their time constant.
+
+Usage: python benchmarks/clock_divider.py [--task mnist|jsb] [--dividers 1 2 4] [--epochs 1]
+"""
+
+import argparse
+import time
+import tensorflow as tf
+import neuroaikit as ai
+import neuroaikit.tf as aitf
+
+
+def mnist(args, k):
+    (train_x, train_y), (test_x, test_y) = tf.keras.datasets.mnist.load_data()
+    train_x = ai.utils.transform_rate(train_x[:args.limit].reshape(-1, 28 * 28) / 255.0, 20, 6)
+    test_x = ai.utils.transform_rate(test_x.reshape(test_x.shape[0], -1) / 255.0, 20, 6)
+    train_y = tf.keras.utils.to_categorical(train_y[:args.limit])
+    test_y = tf.keras.utils.to_categorical(test_y)
+
+    config = {'g': aitf.activations.leaky_rel, 'return_sequences': True}
+    model = tf.keras.Sequential()
+    model.add(tf.keras.layers.InputLayer(input_shape=[None, 28 * 28]))
+    model.add(aitf.layers.SNU(250, decay=0.9, **config))
+    model.add(aitf.layers.SNU(250, decay=0.9 ** k, clock_divider=k, **config))
+    model.add(aitf.layers.SNU(10, decay=0.9 ** k, **config))
+    model.add(tf.keras.layers.GlobalAveragePooling1D())
+    model.compile(optimizer=tf.keras.optimizers.SGD(learning_rate=0.5), loss='mse', metrics=['accuracy'])
+    time_start = time.time()
+    model.fit(train_x, train_y, epochs=args.epochs, batch_size=15, verbose=0)
+    duration = time.time() - time_start
+    _, accuracy = model.evaluate(test_x, test_y, verbose=0)
+    evaluations = (250 + (250 + 10) / k) / (250 + 250 + 10)
+    return 'accuracy', accuracy, duration, evaluations
+
+
+def jsb(args, k):
+    import neuroaikit.dataset.datasets as aid
+    train, _, test = aid.JSB()
+    config = {'g': aitf.activations.leaky_rel, 'return_sequences': True}
+    inputs = tf.keras.Input(shape=[None, 88])
+    fast = aitf.layers.SNU(150, decay=0.8, **config)(inputs)
+    slow = aitf.layers.SNU(150, decay=0.8 ** k, clock_divider=k, **config)(fast)
+    if k > 1:
+        slow = tf.keras.layers.UpSampling1D(k)(slow)
+        slow = tf.keras.layers.ZeroPadding1D((k - 1, 0))(slow)  # window j is complete at step j * k + k - 1
+        slow = tf.keras.layers.Lambda(lambda x: x[0][:, :tf.shape(x[1])[1]])([slow, inputs])
+    outputs = tf.keras.layers.Dense(88)(tf.keras.layers.Concatenate()([fast, slow]))
+    model = tf.keras.Model(inputs, outputs)
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=0.01),
+                  loss=tf.keras.losses.BinaryCrossentropy(from_logits=True))
+
+    def dataset(songs):
+        ds = tf.data.Dataset.from_generator(lambda: songs, tf.float32, output_shapes=[None, None])
+        return ds.map(lambda x: (tf.expand_dims(x[0:-1, :], 0), tf.expand_dims(x[1:, :], 0)))
+
+    time_start = time.time()
+    model.fit(dataset(train), epochs=args.epochs, verbose=0)
+    duration = time.time() - time_start
+    evaluations = (150 + 150 / k) / 300
+    return 'test loss', model.evaluate(dataset(test), verbose=0), duration, evaluations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--task', choices=['mnist', 'jsb'], default='jsb')
+    parser.add_argument('--dividers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--epochs', type=int, default=1)
+    parser.add_argument('--limit', type=int, default=60000, help='number of MNIST training examples')
+    args = parser.parse_args()
+
+    task = {'mnist': mnist, 'jsb': jsb}[args.task]
+    print('{:>8} {:>12} {:>12} {:>18}'.format('divider', 'metric', 'time [s]', 'cell evaluations'))
+    for k in args.dividers:
+        tf.keras.backend.clear_session()
+        metric, value, duration, evaluations = task(args, k)
+        print('{:>8} {:>12.4f} {:>12.2f} {:>17.0%}  ({})'.format(k, value, duration, evaluations, metric))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark of the peak memory and training step time of SNU layers keeping spikes for the backward pass
+as uint8 (compact_spikes=True) against the default float32 storage.
+
+Every configuration runs in a separate process, so that the peak resident memory is measured independently.
+
+Usage: python benchmarks/compact_spikes.py [--units 1024] [--layers 3] [--timesteps 500] [--batch 32]
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+import numpy as np
+import tensorflow as tf
+import neuroaikit.tf as aitf
+
+
+def run(args):
+    x = (np.random.random((args.batch, args.timesteps, args.units)) < 0.1).astype(np.float32)
+    y = (np.random.random((args.batch, args.units)) < 0.1).astype(np.float32)
+    model = tf.keras.Sequential()
+    model.add(tf.keras.layers.InputLayer(input_shape=[None, args.units]))
+    for _ in range(args.layers):
+        model.add(aitf.layers.SNU(args.units, compact_spikes=args.compact, return_sequences=True))
+    model.add(tf.keras.layers.GlobalAveragePooling1D())
+    model.compile(optimizer=tf.keras.optimizers.SGD(learning_rate=0.1), loss='mse')
+    model.train_on_batch(x, y)  # warm-up and graph tracing
+    time_start = time.time()
+    for _ in range(args.repeats):
+        model.train_on_batch(x, y)
+    duration = (time.time() - time_start) / args.repeats
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # kB on Linux
+    print(json.dumps({'time': duration, 'peak_MiB': peak}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--units', type=int, default=1024)
+    parser.add_argument('--layers', type=int, default=3)
+    parser.add_argument('--timesteps', type=int, default=500)
+    parser.add_argument('--batch', type=int, default=32)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--compact', type=int, choices=[0, 1], default=None, help='run a single configuration')
+    args = parser.parse_args()
+    if args.compact is not None:
+        run(args)
+        return
+
+    print('{:>16} {:>14} {:>12}'.format('compact_spikes', 'step time [s]', 'peak [MiB]'))
+    for compact in [0, 1]:
+        output = subprocess.run([sys.executable, __file__, '--compact', str(compact)] + sys.argv[1:],
+                                stdout=subprocess.PIPE, check=True, universal_newlines=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print('{:>16} {:>14.2f} {:>12.1f}'.format(str(bool(compact)), result['time'], result['peak_MiB']))
+
+
+if __name__ == '__main__':
+    main()
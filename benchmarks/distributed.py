@@ -0,0 +1,108 @@
+"""Scaling benchmark of multi-worker data-parallel training of an SNU network with MultiWorkerMirroredStrategy.
+
+For every worker count, the given number of local CPU worker processes is started with TF_CONFIG describing
+a cluster on localhost. The workers train on rate-encoded MNIST-like data sharded with
+`neuroaikit.tf.data.distributed_spike_dataset`, with a fixed per-worker batch size (weak scaling),
+and the chief reports the throughput.
+
+Usage: python benchmarks/distributed.py [--workers 1 2 4] [--threads 1] [--steps 50] [--batch-size 64]
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+
+def free_ports(count):
+    sockets = [socket.socket() for _ in range(count)]
+    for s in sockets:
+        s.bind(('localhost', 0))
+    ports = [s.getsockname()[1] for s in sockets]
+    for s in sockets:
+        s.close()
+    return ports
+
+
+def run_worker(args):
+    import numpy as np
+    import tensorflow as tf
+    import neuroaikit.tf as aitf
+
+    tf.config.threading.set_intra_op_parallelism_threads(args.threads)
+    tf.config.threading.set_inter_op_parallelism_threads(args.threads)
+    strategy = tf.distribute.MultiWorkerMirroredStrategy()
+    global_batch_size = args.batch_size * strategy.num_replicas_in_sync
+    rng = np.random.RandomState(0)
+    examples = global_batch_size * args.steps
+    x = rng.rand(examples, 784).astype(np.float32) * (rng.rand(examples, 784) > 0.8)
+    y = rng.randint(0, 10, examples)
+
+    with strategy.scope():
+        model = tf.keras.Sequential()
+        model.add(tf.keras.layers.InputLayer(input_shape=[args.timesteps, 784]))
+        model.add(aitf.layers.SNU(args.units, return_sequences=True))
+        model.add(aitf.layers.SNU(args.units, lateral_inhibition=True))
+        model.add(tf.keras.layers.Dense(10))
+        model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=0.001),
+                      loss=tf.keras.losses.SparseCategoricalCrossentropy(from_logits=True))
+    dataset = aitf.data.distributed_spike_dataset(strategy, x, y, args.timesteps, global_batch_size)
+    model.fit(dataset, epochs=1, steps_per_epoch=args.warmup, verbose=0)  # tracing and warm-up
+    time_start = time.time()
+    model.fit(dataset, epochs=1, steps_per_epoch=args.steps, verbose=0)
+    duration = time.time() - time_start
+    if json.loads(os.environ['TF_CONFIG'])['task']['index'] == 0:
+        print(json.dumps({'time': duration, 'examples_per_s': args.steps * global_batch_size / duration}))
+
+
+def run_cluster(workers, argv):
+    ports = free_ports(workers)
+    cluster = {'worker': ['localhost:{}'.format(port) for port in ports]}
+    processes = []
+    for index in range(workers):
+        env = dict(os.environ, TF_CONFIG=json.dumps({'cluster': cluster, 'task': {'type': 'worker', 'index': index}}))
+        processes.append(subprocess.Popen([sys.executable, __file__, '--worker'] + argv, env=env,
+                                          stdout=subprocess.PIPE, universal_newlines=True))
+    outputs = [process.communicate()[0] for process in processes]
+    if any(process.returncode for process in processes):
+        raise RuntimeError('A worker failed')
+    return json.loads(outputs[0].strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--threads', type=int, default=1, help='threads per worker')
+    parser.add_argument('--steps', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--batch-size', type=int, default=64, help='batch size per worker')
+    parser.add_argument('--units', type=int, default=256)
+    parser.add_argument('--timesteps', type=int, default=20)
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        run_worker(args)
+        return
+
+    argv = list(sys.argv[1:])
+    if '--workers' in argv:  # the worker count is given by TF_CONFIG
+        start = argv.index('--workers')
+        end = start + 1
+        while end < len(argv) and not argv[end].startswith('--'):
+            end += 1
+        del argv[start:end]
+    print('{:>8} {:>14} {:>9} {:>11}'.format('Workers', 'Examples/s', 'Speedup', 'Efficiency'))
+    baseline = None
+    for workers in args.workers:
+        result = run_cluster(workers, argv)
+        baseline = baseline or result['examples_per_s'] / workers
+        speedup = result['examples_per_s'] / baseline
+        print('{:>8} {:>14.1f} {:>9.2f} {:>10.0%}'.format(workers, result['examples_per_s'], speedup,
+                                                         speedup / workers))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark of online e-prop training against BPTT on the JSB task: test loss, training time and peak memory.
+
+Every training mode runs in a separate process, so that the peak resident memory is measured independently.
+
+Usage: python benchmarks/eprop.py [--epochs 1] [--units 150] [--repeat 1]
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+import numpy as np
+import tensorflow as tf
+import neuroaikit.dataset.datasets as aid
+import neuroaikit.tf as aitf
+
+
+def build(units):
+    model = tf.keras.Sequential()
+    model.add(tf.keras.layers.InputLayer(input_shape=[None, 88]))
+    model.add(aitf.layers.SNU(units, decay=0.8, g=aitf.activations.leaky_rel, return_sequences=True))
+    model.add(tf.keras.layers.Dense(88))  # output logits
+    return model
+
+
+def songs(data, repeat):
+    # repeating a song along time gives longer sequences to show how the memory scales with the sequence length
+    for song in data:
+        song = np.tile(song, (repeat, 1)).astype(np.float32)
+        yield song[np.newaxis, :-1], song[np.newaxis, 1:]
+
+
+def run(args):
+    train, _, test = aid.JSB()
+    loss = tf.keras.losses.BinaryCrossentropy(from_logits=True)
+    model = build(args.units)
+    time_start = time.time()
+    if args.mode == 'bptt':
+        model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=0.01), loss=loss)
+        for _ in range(args.epochs):
+            for x, y in songs(train, args.repeat):
+                model.train_on_batch(x, y)
+    else:
+        trainer = aitf.online.EProp(model, lambda y, logits: loss(y, logits),
+                                    tf.keras.optimizers.Adam(learning_rate=0.01), update_every=args.update_every)
+        trainer.fit(list(songs(train, args.repeat)), epochs=args.epochs, verbose=0)
+    duration = time.time() - time_start
+    test_loss = np.mean([loss(y, model(x)).numpy() for x, y in songs(test, 1)])
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # kB on Linux
+    print(json.dumps({'mode': args.mode, 'test_loss': float(test_loss), 'time': duration, 'peak_MiB': peak}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--mode', choices=['bptt', 'eprop'], default=None, help='run a single mode in this process')
+    parser.add_argument('--epochs', type=int, default=1)
+    parser.add_argument('--units', type=int, default=150)
+    parser.add_argument('--repeat', type=int, default=1, help='number of times every training song is repeated')
+    parser.add_argument('--update_every', type=int, default=16, help='e-prop update interval in timesteps')
+    args = parser.parse_args()
+    if args.mode is not None:
+        run(args)
+        return
+
+    print('{:>8} {:>10} {:>10} {:>12}'.format('mode', 'test loss', 'time [s]', 'peak [MiB]'))
+    for mode in ['bptt', 'eprop']:
+        output = subprocess.run([sys.executable, __file__, '--mode', mode] + sys.argv[1:],
+                                stdout=subprocess.PIPE, check=True, universal_newlines=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print('{:>8} {:>10.4f} {:>10.1f} {:>12.1f}'.format(mode, result['test_loss'], result['time'],
+                                                           result['peak_MiB']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark of autoregressive generation on the JSB task: cached SNU states against re-evaluating the prefix.
+
+Usage: python benchmarks/generate.py [--units 150] [--length 100] [--num-sequences 1000]
+"""
+
+import argparse
+import time
+import numpy as np
+import tensorflow as tf
+import neuroaikit.dataset.datasets as aid
+import neuroaikit.tf as aitf
+
+
+def build(units):
+    model = tf.keras.Sequential()
+    model.add(tf.keras.layers.InputLayer(input_shape=[None, 88]))
+    model.add(aitf.layers.SNU(units, decay=0.8, g=aitf.activations.leaky_rel, return_sequences=True))
+    model.add(tf.keras.layers.Dense(88))  # output logits
+    return model
+
+
+def generate_prefix(model, prime, length):
+    # baseline: the entire sequence generated so far is evaluated again in every timestep
+    sequences = prime
+    for _ in range(length):
+        logits = model(sequences, training=False)[:, -1:]
+        sequences = tf.concat([sequences, tf.cast(logits > 0, tf.float32)], 1)
+    return sequences[:, prime.shape[1]:].numpy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--units', type=int, default=150)
+    parser.add_argument('--length', type=int, default=100)
+    parser.add_argument('--num-sequences', type=int, default=1000)
+    parser.add_argument('--prime', type=int, default=8)
+    args = parser.parse_args()
+
+    _, valid, _ = aid.JSB()
+    model = build(args.units)
+    prime = np.tile(valid[0][np.newaxis, :args.prime].astype(np.float32), (args.num_sequences, 1, 1))
+
+    time_start = time.time()
+    cached, _ = aitf.generate.generate(model, prime, args.length)
+    time_cached = time.time() - time_start
+    time_start = time.time()
+    prefix = generate_prefix(model, tf.constant(prime), args.length)
+    time_prefix = time.time() - time_start
+    print('Identical sequences: {}'.format(np.array_equal(cached, prefix)))
+    for name, elapsed in (('cached states', time_cached), ('prefix', time_prefix)):
+        print('{:>14}: {:7.2f} s, {:9.1f} sequences/s'.format(name, elapsed, args.num_sequences / elapsed))
+
+
+if __name__ == '__main__':
+    main()
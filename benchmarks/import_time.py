@@ -0,0 +1,69 @@
+"""Benchmark of import time and memory of the toolkit modules that guards against import regressions.
+
+Every import runs in a fresh interpreter. The script fails (exit code 1) if a module that must stay light imports
+TensorFlow or NumPy, or takes longer than `--max_seconds` to import.
+
+Usage: python benchmarks/import_time.py [--max_seconds 0.5] [--repeats 3]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+# module -> heavy modules that it must not import
+LIGHT = {
+    'neuroaikit': ['tensorflow', 'numpy'],
+    'neuroaikit.tf': ['tensorflow'],
+    'neuroaikit.tf.layers': ['tensorflow'],
+    'neuroaikit.common.utils': ['tensorflow'],
+    'neuroaikit.dataset.datasets': ['tensorflow'],
+}
+# measured for reference only
+HEAVY = ['neuroaikit.tf.activations', 'neuroaikit.tf.layers.snu']
+
+PROBE = '''
+import json, resource, sys, time
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+time_start = time.perf_counter()
+import {module}
+duration = time.perf_counter() - time_start
+print(json.dumps({{"time": duration, "rss_kB": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss,
+                  "modules": [m for m in ("tensorflow", "numpy") if m in sys.modules]}}))
+'''
+
+
+def measure(module, repeats):
+    results = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', PROBE.format(module=module)], stdout=subprocess.PIPE,
+                                check=True, universal_newlines=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return min(results, key=lambda result: result['time'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--max_seconds', type=float, default=0.5, help='time limit for the light modules')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    failures = []
+    print('{:>30} {:>10} {:>12}  {}'.format('module', 'time [s]', 'RSS [MiB]', 'heavy modules imported'))
+    for module in list(LIGHT) + HEAVY:
+        result = measure(module, args.repeats)
+        print('{:>30} {:>10.3f} {:>12.1f}  {}'.format(module, result['time'], result['rss_kB'] / 1024,
+                                                      ', '.join(result['modules']) or '-'))
+        if module in LIGHT:
+            forbidden = set(LIGHT[module]) & set(result['modules'])
+            if forbidden:
+                failures.append('{} imports {}'.format(module, ', '.join(sorted(forbidden))))
+            if result['time'] > args.max_seconds:
+                failures.append('{} takes {:.3f} s to import'.format(module, result['time']))
+    for failure in failures:
+        print('FAIL:', failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
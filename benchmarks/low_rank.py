@@ -0,0 +1,56 @@
+"""Benchmark of step time and weight memory of recurrent SNU layers with low-rank factorized recurrent weights
+against the dense recurrent SNU layer.
+
+Usage: python benchmarks/low_rank.py [--units 4096] [--timesteps 20] [--batch 16]
+"""
+
+import argparse
+import time
+import numpy as np
+import tensorflow as tf
+import neuroaikit.tf as aitf
+
+
+def build(args, rank):
+    model = tf.keras.Sequential()
+    model.add(tf.keras.layers.InputLayer(input_shape=[None, args.inputs]))
+    model.add(aitf.layers.SNU(args.units, recurrent=True, recurrent_rank=rank, diagonal=rank is not None,
+                              return_sequences=True))
+    model.compile(optimizer=tf.keras.optimizers.SGD(learning_rate=0.01), loss='mse')
+    return model
+
+
+def step_time(function, repeats, timesteps):
+    function()  # warm-up and graph tracing
+    time_start = time.time()
+    for _ in range(repeats):
+        function()
+    return (time.time() - time_start) / repeats / timesteps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--inputs', type=int, default=256)
+    parser.add_argument('--units', type=int, default=4096)
+    parser.add_argument('--timesteps', type=int, default=20)
+    parser.add_argument('--batch', type=int, default=16)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--ranks', type=int, nargs='+', default=[32, 128, 512])
+    args = parser.parse_args()
+
+    x = (np.random.random((args.batch, args.timesteps, args.inputs)) < 0.1).astype(np.float32)
+    y = np.zeros((args.batch, args.timesteps, args.units), dtype=np.float32)
+    print('{:>8} {:>12} {:>18} {:>18} {:>16}'.format('rank', 'parameters', 'weights [MiB]',
+                                                      'inference [ms/step]', 'training [ms/step]'))
+    for rank in [None] + args.ranks:
+        model = build(args, rank)
+        parameters = model.count_params()
+        inference = step_time(lambda: model.predict(x, batch_size=args.batch, verbose=0), args.repeats, args.timesteps)
+        training = step_time(lambda: model.train_on_batch(x, y), args.repeats, args.timesteps)
+        print('{:>8} {:>12} {:>18.1f} {:>18.3f} {:>16.3f}'.format('dense' if rank is None else rank, parameters,
+                                                                  parameters * 4 / 2 ** 20, 1000 * inference,
+                                                                  1000 * training))
+
+
+if __name__ == '__main__':
+    main()
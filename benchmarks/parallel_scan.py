@@ -0,0 +1,97 @@
+"""Benchmark of accuracy and wall-clock of SNU layers computed with a parallel scan (SNUScan)
+against the sequential SNU layers (SNUBasicCell) on the MNIST and JSB examples and on long synthetic sequences.
+
+Usage: python benchmarks/parallel_scan.py [--task mnist|jsb|long] [--epochs 1] [--reset_iterations 1]
+"""
+
+import argparse
+import time
+import numpy as np
+import tensorflow as tf
+import neuroaikit as ai
+import neuroaikit.tf as aitf
+
+
+def mnist(args, parallel_scan):
+    (train_x, train_y), (test_x, test_y) = tf.keras.datasets.mnist.load_data()
+    train_x = ai.utils.transform_rate(train_x[:args.limit].reshape(-1, 28 * 28) / 255.0, 20, 6)
+    test_x = ai.utils.transform_rate(test_x.reshape(test_x.shape[0], -1) / 255.0, 20, 6)
+    train_y = tf.keras.utils.to_categorical(train_y[:args.limit])
+    test_y = tf.keras.utils.to_categorical(test_y)
+
+    config = {'decay': 0.9, 'parallel_scan': parallel_scan, 'return_sequences': True}
+    if parallel_scan:
+        config['reset_iterations'] = args.reset_iterations
+    model = tf.keras.Sequential()
+    model.add(tf.keras.layers.InputLayer(input_shape=[None, 28 * 28]))
+    model.add(aitf.layers.SNU(250, **config))
+    model.add(aitf.layers.SNU(250, **config))
+    model.add(aitf.layers.SNU(10, **config))
+    model.add(tf.keras.layers.GlobalAveragePooling1D())
+    model.compile(optimizer=tf.keras.optimizers.SGD(learning_rate=0.5), loss='mse', metrics=['accuracy'])
+    time_start = time.time()
+    model.fit(train_x, train_y, epochs=args.epochs, batch_size=15, verbose=0)
+    duration = time.time() - time_start
+    _, accuracy = model.evaluate(test_x, test_y, verbose=0)
+    return 'accuracy', accuracy, duration
+
+
+def jsb(args, parallel_scan):
+    import neuroaikit.dataset.datasets as aid
+    train, _, test = aid.JSB()
+    config = {'decay': 0.8, 'parallel_scan': parallel_scan, 'return_sequences': True}
+    if parallel_scan:
+        config['reset_iterations'] = args.reset_iterations
+    model = tf.keras.Sequential()
+    model.add(tf.keras.layers.InputLayer(input_shape=[None, 88]))
+    model.add(aitf.layers.SNU(150, **config))
+    model.add(tf.keras.layers.Dense(88))
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=0.01),
+                  loss=tf.keras.losses.BinaryCrossentropy(from_logits=True))
+
+    def dataset(songs):
+        ds = tf.data.Dataset.from_generator(lambda: songs, tf.float32, output_shapes=[None, None])
+        return ds.map(lambda x: (tf.expand_dims(x[0:-1, :], 0), tf.expand_dims(x[1:, :], 0)))
+
+    time_start = time.time()
+    model.fit(dataset(train), epochs=args.epochs, verbose=0)
+    duration = time.time() - time_start
+    return 'test loss', model.evaluate(dataset(test), verbose=0), duration
+
+
+def long(args, parallel_scan):
+    x = (np.random.random((args.batch, args.timesteps, 100)) < 0.1).astype(np.float32)
+    y = (np.random.random((args.batch, args.timesteps, 100)) < 0.1).astype(np.float32)
+    config = {'parallel_scan': parallel_scan, 'return_sequences': True}
+    model = tf.keras.Sequential()
+    model.add(tf.keras.layers.InputLayer(input_shape=[None, 100]))
+    model.add(aitf.layers.SNU(256, **config))
+    model.add(tf.keras.layers.Dense(100))
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=0.01),
+                  loss=tf.keras.losses.BinaryCrossentropy(from_logits=True))
+    model.train_on_batch(x, y)  # warm-up and graph tracing
+    time_start = time.time()
+    for _ in range(args.epochs):
+        loss = model.train_on_batch(x, y)
+    return 'train loss', loss, (time.time() - time_start) / args.epochs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--task', choices=['mnist', 'jsb', 'long'], default='long')
+    parser.add_argument('--epochs', type=int, default=1)
+    parser.add_argument('--reset_iterations', type=int, default=1)
+    parser.add_argument('--limit', type=int, default=60000, help='number of MNIST training examples')
+    parser.add_argument('--timesteps', type=int, default=1000, help='sequence length of the long task')
+    parser.add_argument('--batch', type=int, default=16, help='batch size of the long task')
+    args = parser.parse_args()
+
+    task = {'mnist': mnist, 'jsb': jsb, 'long': long}[args.task]
+    print('{:>16} {:>12} {:>12}'.format('layer', 'metric', 'time [s]'))
+    for name, parallel_scan in [('SNUBasicCell', False), ('SNUScan', True)]:
+        metric, value, duration = task(args, parallel_scan)
+        print('{:>16} {:>12.4f} {:>12.2f}  ({})'.format(name, value, duration, metric))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark of inference latency and weight memory of pruned sparse SNU layers against the dense SNU layer.
+
+Usage: python benchmarks/pruning.py [--inputs 1024] [--units 1024] [--timesteps 50] [--batch 32]
+"""
+
+import argparse
+import time
+import numpy as np
+import tensorflow as tf
+import neuroaikit.tf as aitf
+
+
+def weight_bytes(layer):
+    return sum(np.prod(w.shape) * tf.as_dtype(w.dtype).size for w in layer.weights)
+
+
+def latency(model, x, repeats):
+    model.predict(x, verbose=0)  # warm-up and graph tracing
+    time_start = time.time()
+    for _ in range(repeats):
+        model.predict(x, verbose=0)
+    return (time.time() - time_start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--inputs', type=int, default=1024)
+    parser.add_argument('--units', type=int, default=1024)
+    parser.add_argument('--timesteps', type=int, default=50)
+    parser.add_argument('--batch', type=int, default=32)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--recurrent', action='store_true')
+    args = parser.parse_args()
+
+    x = (np.random.random((args.batch, args.timesteps, args.inputs)) < 0.1).astype(np.float32)
+    model = tf.keras.Sequential()
+    model.add(tf.keras.layers.InputLayer(input_shape=[None, args.inputs]))
+    model.add(aitf.layers.SNU(args.units, recurrent=args.recurrent, return_sequences=True))
+    dense_weights = model.get_weights()
+
+    dense_time = latency(model, x, args.repeats)
+    dense_bytes = weight_bytes(model.layers[0])
+    print('{:>10} {:>12} {:>10} {:>14} {:>10}'.format('sparsity', 'latency [ms]', 'speedup', 'weights [KiB]', 'ratio'))
+    print('{:>10} {:>12.1f} {:>10.2f} {:>14.1f} {:>10.2f}'.format('dense', 1000 * dense_time, 1.0,
+                                                                  dense_bytes / 1024, 1.0))
+    for sparsity in [0.5, 0.8, 0.9, 0.95, 0.99]:
+        for variable in aitf.pruning.prunable_weights(model):
+            variable.assign(aitf.pruning.magnitude_mask(variable.numpy(), sparsity) * variable.numpy())
+        sparse_model = aitf.pruning.sparsify(model)
+        sparse_time = latency(sparse_model, x, args.repeats)
+        sparse_bytes = weight_bytes(sparse_model.layers[0])
+        print('{:>10} {:>12.1f} {:>10.2f} {:>14.1f} {:>10.2f}'.format(sparsity, 1000 * sparse_time,
+                                                                      dense_time / sparse_time,
+                                                                      sparse_bytes / 1024, sparse_bytes / dense_bytes))
+        model.set_weights(dense_weights)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark of the firing-rate regularization of SNU layers on the JSB example: test loss, achieved firing rates
+and the number of synaptic events per timestep, i.e. the spikes of every SNU layer times their fan-out, which
+determines the inference cost on event-driven hardware or with sparse (event-driven) kernels.
+
+Usage: python benchmarks/rate_regularization.py [--sparsity 0 0.01 0.1] [--target-rate 0.05] [--epochs 1]
+"""
+
+import argparse
+import numpy as np
+import tensorflow as tf
+import neuroaikit.tf as aitf
+
+
+def jsb(args, regularizer):
+    import neuroaikit.dataset.datasets as aid
+    train, _, test = aid.JSB()
+    config = {'g': aitf.activations.leaky_rel, 'return_sequences': True, 'rate_regularizer': regularizer}
+    model = tf.keras.Sequential()
+    model.add(tf.keras.layers.InputLayer(input_shape=[None, 88]))
+    model.add(aitf.layers.SNU(150, decay=0.8, **config))
+    model.add(aitf.layers.SNU(150, decay=0.8, **config))
+    model.add(tf.keras.layers.Dense(88))
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=0.01),
+                  loss=tf.keras.losses.BinaryCrossentropy(from_logits=True))
+
+    def dataset(songs):
+        ds = tf.data.Dataset.from_generator(lambda: songs, tf.float32, output_shapes=[None, None])
+        return ds.map(lambda x: (tf.expand_dims(x[0:-1, :], 0), tf.expand_dims(x[1:, :], 0)))
+
+    model.fit(dataset(train), epochs=args.epochs, verbose=0)
+    # the regularization losses are excluded from the reported loss
+    loss = tf.keras.losses.BinaryCrossentropy(from_logits=True)
+    test_loss = np.mean([float(loss(song[1:], model(song[None, :-1])[0])) for song in test])
+    rates = [aitf.regularizers.firing_rates(model, song[None, :-1]) for song in test]
+    rates = [np.mean([r[name] for r in rates], 0) for name in rates[0]]
+    fan_out = [model.layers[1].cell.units, model.layers[2].units]  # the spikes of a layer drive the next layer
+    events = sum(float(r.sum()) * n for r, n in zip(rates, fan_out))
+    return test_loss, [float(r.mean()) for r in rates], events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sparsity', type=float, nargs='+', default=[0.0, 0.01, 0.1])
+    parser.add_argument('--target-rate', type=float, default=None)
+    parser.add_argument('--min-rate', type=float, default=None)
+    parser.add_argument('--epochs', type=int, default=1)
+    args = parser.parse_args()
+
+    print('{:>10} {:>12} {:>18} {:>18}'.format('sparsity', 'test loss', 'rates (layers)', 'synaptic events'))
+    for sparsity in args.sparsity:
+        tf.keras.backend.clear_session()
+        regularizer = None
+        if sparsity or args.target_rate is not None or args.min_rate is not None:
+            regularizer = aitf.regularizers.FiringRateRegularizer(target_rate=args.target_rate, sparsity=sparsity,
+                                                                  min_rate=args.min_rate)
+        test_loss, rates, events = jsb(args, regularizer)
+        rates = ' '.join('{:.3f}'.format(r) for r in rates)
+        print('{:>10} {:>12.4f} {:>18} {:>18.0f}'.format(sparsity, test_loss, rates, events))
+
+
+if __name__ == '__main__':
+    main()
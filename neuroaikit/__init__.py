@@ -1,4 +1,14 @@
 """Main Neuro-inspired AI Toolkit namespace.
+
+Subpackages are imported lazily on first access, e.g. `neuroaikit.utils` or `neuroaikit.tf`,
+so that importing the toolkit does not import NumPy or TensorFlow.
 """
 
-from .common import utils
\ No newline at end of file
+from .common.lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'utils': '.common.utils',
+    'common': '.common',
+    'dataset': '.dataset',
+    'tf': '.tf',
+})
@@ -0,0 +1,126 @@
+"""Rendering of spike trains and piano rolls to audio.
+
+Every timestep of a [time, 88] array, e.g. a JSB chorale or generated notes, becomes a short note of the given
+duration, in which every active key plays a tone of frequency f(n) = 2 ** ((n - 49) / 12) * 440 [Hz]. The tones
+of all keys over one timestep are precomputed as a [88, samples] wavetable, so that the audio of a chunk of
+timesteps is a single matrix product of the chunk with the wavetable.
+
+Usage::
+
+    from neuroaikit.common import audio
+    from IPython.display import Audio
+    Audio(audio.render(song), rate=44100)
+    audio.write_wav('song.wav', song)
+"""
+
+import functools
+import wave
+import numpy as np
+
+WAVEFORMS = {
+    'sine': lambda phase: np.sin(phase),
+    'organ': lambda phase: np.clip(2 * np.sin(phase), 0, 1),
+}
+
+
+def note_frequencies(keys=88):
+    """Returns the frequencies of piano keys, f(n) = 2 ** ((n - 49) / 12) * 440 [Hz].
+
+    :param keys: number of keys, defaults to 88
+    :return: NumPy array [keys] with the frequencies
+    """
+    return 2 ** ((np.arange(keys) - 49) / 12) * 440
+
+
+@functools.lru_cache(maxsize=8)
+def wavetable(keys=88, note=0.25, rate=44100, waveform='organ'):
+    """Precomputes the tones of all keys over one timestep. The wavetables are cached and must not be modified.
+
+    :param keys: number of keys, defaults to 88
+    :param note: duration of one timestep in seconds, defaults to 0.25
+    :param rate: sampling rate in Hz, defaults to 44100
+    :param waveform: 'organ' or 'sine', defaults to 'organ'
+    :return: float32 NumPy array [keys, samples]
+    """
+    t = np.linspace(0, note, int(rate * note))
+    table = WAVEFORMS[waveform](2 * np.pi * np.outer(note_frequencies(keys), t))
+    table *= np.clip(30.0 * np.sin(np.pi * t / note), 0.0, 1.0)  # smoothen to avoid 'cracks'
+    return table.astype(np.float32)
+
+
+def render_chunks(song, note=0.25, rate=44100, waveform='organ', chunk=256, normalize=False):
+    """Renders a song to audio chunk by chunk, so that the entire waveform is never kept in memory.
+
+    :param song: array [time, keys] or [batch, time, keys] with binary notes or spikes
+    :param note: duration of one timestep in seconds, defaults to 0.25
+    :param rate: sampling rate in Hz, defaults to 44100
+    :param waveform: 'organ' or 'sine', defaults to 'organ'
+    :param chunk: number of timesteps rendered at once in total over all songs of the batch, defaults to 256,
+        i.e. every chunk has at most `chunk * note * rate` samples regardless of the batch size
+    :param normalize: bool, defaults to False. If True, the audio is scaled by the maximum number of
+        simultaneous notes of every song, so that its values stay within [-1, 1].
+    :return: generator of float32 NumPy arrays [samples] or [batch, samples]
+    """
+    song = np.asarray(song)
+    batched = song.ndim == 3
+    if not batched:
+        song = song[np.newaxis]
+    table = wavetable(song.shape[-1], note, rate, waveform)
+    scale = None
+    if normalize:
+        scale = 1.0 / np.maximum(song.sum(-1).max(-1), 1).astype(np.float32)[:, np.newaxis]
+    steps = max(1, chunk // song.shape[0])  # timesteps per song in a chunk
+    for start in range(0, song.shape[1], steps):
+        notes = song[:, start:start + steps].astype(np.float32)
+        data = (notes @ table).reshape(song.shape[0], -1)  # [batch, chunk * samples]
+        if scale is not None:
+            data *= scale
+        yield data if batched else data[0]
+
+
+def render(song, note=0.25, rate=44100, waveform='organ', normalize=False):
+    """Renders a song to audio.
+
+    :param song: array [time, keys] or [batch, time, keys] with binary notes or spikes
+    :param note: duration of one timestep in seconds, defaults to 0.25
+    :param rate: sampling rate in Hz, defaults to 44100
+    :param waveform: 'organ' or 'sine', defaults to 'organ'
+    :param normalize: bool, defaults to False. See :func:`render_chunks`.
+    :return: float32 NumPy array [samples] or [batch, samples]
+    """
+    return np.concatenate(list(render_chunks(song, note, rate, waveform, normalize=normalize)), axis=-1)
+
+
+def write_wav(path, song, note=0.25, rate=44100, waveform='organ', chunk=256, open_files=64):
+    """Renders a song chunk by chunk into a 16-bit mono WAV file. The audio is normalized.
+
+    :param path: path of the WAV file, or a list of paths (one per song) for a batch of songs
+    :param song: array [time, keys] or [batch, time, keys] with binary notes or spikes
+    :param note: duration of one timestep in seconds, defaults to 0.25
+    :param rate: sampling rate in Hz, defaults to 44100
+    :param waveform: 'organ' or 'sine', defaults to 'organ'
+    :param chunk: number of timesteps rendered at once in total over the songs, defaults to 256
+    :param open_files: maximal number of WAV files written at the same time, defaults to 64. A batch of songs
+        is rendered in groups of this size.
+    """
+    song = np.asarray(song)
+    paths = [path] if song.ndim == 2 else list(path)
+    if song.ndim == 2:
+        song = song[np.newaxis]
+    if len(paths) != song.shape[0]:
+        raise ValueError('The number of paths must match the number of songs')
+    for start in range(0, len(paths), open_files):
+        files = []
+        try:
+            for p in paths[start:start + open_files]:
+                files.append(wave.open(p, 'wb'))
+                files[-1].setnchannels(1)
+                files[-1].setsampwidth(2)
+                files[-1].setframerate(rate)
+            for data in render_chunks(song[start:start + open_files], note, rate, waveform, chunk, normalize=True):
+                samples = np.round(np.clip(data, -1.0, 1.0) * 32767).astype('<i2')
+                for f, s in zip(files, samples):
+                    f.writeframes(s.tobytes())
+        finally:
+            for f in files:
+                f.close()
@@ -0,0 +1,30 @@
+"""Lazy loading of submodules and attributes, so that importing a package does not import its heavy dependencies.
+"""
+
+import importlib
+
+
+def lazy_attributes(package, attributes):
+    """Creates module-level `__getattr__` and `__dir__` functions (PEP 562) that import attributes on first access.
+
+    :param package: name of the package, i.e. `__name__` of the calling `__init__` module
+    :param attributes: dict mapping attribute names to relative module names. If the module name ends with
+        the attribute name (e.g. 'utils': '.common.utils'), the module itself is the attribute,
+        otherwise the attribute is taken from the module.
+    :return: (__getattr__, __dir__) tuple
+    """
+    def __getattr__(name):
+        if name not in attributes:
+            raise AttributeError('module {!r} has no attribute {!r}'.format(package, name))
+        module_name = attributes[name]
+        if module_name.rsplit('.', 1)[-1] == name:
+            value = importlib.import_module(module_name, package)
+        else:
+            value = getattr(importlib.import_module(module_name, package), name)
+        setattr(importlib.import_module(package), name, value)  # cache, so that __getattr__ is not called again
+        return value
+
+    def __dir__():
+        return sorted(set(vars(importlib.import_module(package))) | set(attributes))
+
+    return __getattr__, __dir__
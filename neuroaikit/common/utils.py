@@ -32,6 +32,80 @@ def transform_rate(data2D, N_ts, max_is_present_for, seed=0):
     return res
 
 
+class DeltaEncoder:
+    """Send-on-delta (temporal contrast) encoder of analog time series into ON/OFF spike channels.
+
+    Every feature keeps a reference value, initially its first sample. Whenever the signal rises (falls) by at least
+    `threshold` above (below) the reference, an ON (OFF) spike is emitted and the reference moves by the crossed
+    multiples of the threshold. The encoder is vectorized over the batch and the features and keeps its state
+    between calls of `encode`, so that long streams can be encoded chunk by chunk with memory bounded by the chunk
+    size, with the same result as encoding the entire stream at once.
+
+    :param threshold: float or array [features] with the change that triggers a spike
+    :param binary: bool, defaults to True. If True, at most one spike per channel and timestep is emitted
+        and the reference moves by at most one threshold, i.e. the spikes lag behind fast changes.
+        Otherwise, the number of crossed thresholds, at most 255, is emitted.
+    """
+
+    def __init__(self, threshold, binary=True):
+        """Constructor method"""
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.binary = binary
+        self.reference = None
+
+    def reset(self):
+        """Resets the reference values before a new stream."""
+        self.reference = None
+
+    def encode(self, x):
+        """Encodes the next chunk of the stream.
+
+        :param x: array [batch, time, features] or [time, features]
+        :return: uint8 array [batch, time, 2 * features] or [time, 2 * features] with the ON spikes
+            in the first and the OFF spikes in the second half of the features
+        """
+        x = np.asarray(x, dtype=np.float64)
+        batched = x.ndim == 3
+        if not batched:
+            x = x[np.newaxis]
+        if self.reference is None:
+            self.reference = x[:, 0].copy()
+        features = x.shape[2]
+        spikes = np.zeros(x.shape[:2] + (2 * features,), dtype=np.uint8)
+        for t in range(x.shape[1]):
+            crossings = np.trunc((x[:, t] - self.reference) / self.threshold)
+            # the reference moves only by the emitted spikes, i.e. it lags behind changes beyond the uint8 range
+            crossings = np.clip(crossings, -1, 1) if self.binary else np.clip(crossings, -255, 255)
+            self.reference += crossings * self.threshold
+            spikes[:, t, :features] = np.maximum(crossings, 0)
+            spikes[:, t, features:] = np.maximum(-crossings, 0)
+        return spikes if batched else spikes[0]
+
+
+def delta_encode(x, threshold, binary=True):
+    """
+        Encodes entire time series into ON/OFF spike channels using send-on-delta coding, see DeltaEncoder.
+        x - array [batch, time, features] or [time, features]
+        threshold - change that triggers a spike, float or per-feature array
+        binary - if True at most one spike per channel and timestep, otherwise the number of crossed thresholds
+    """
+    return DeltaEncoder(threshold, binary).encode(x)
+
+
+def delta_decode(spikes, threshold, initial=0.0):
+    """
+        Reconstructs the reference values of send-on-delta coding from the ON/OFF spikes.
+        For non-binary coding, the reconstruction differs from the original signal by less than the threshold,
+        unless the signal changes by more than 255 thresholds in one timestep.
+        spikes - array [..., time, 2 * features]
+        threshold - change that triggers a spike, float or per-feature array
+        initial - first sample of the time series
+    """
+    features = spikes.shape[-1] // 2
+    steps = spikes[..., :features].astype(np.float64) - spikes[..., features:]
+    return initial + np.cumsum(steps, axis=-2) * threshold
+
+
 def load(name, limit=2):
     try:
         with open(name + '.pkl', 'rb') as f:
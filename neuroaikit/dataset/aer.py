@@ -0,0 +1,259 @@
+"""Streaming ingestion of address-event representation (AER) recordings, e.g. from event cameras or
+neuromorphic audio sensors, into spike frames for SNU layers.
+
+A recording is a time-sorted stream of `(t, x, y, p)` events. The events are read in chunks and binned into frames
+[T, features] of `bin_size` time units, where the features are the (downsampled) pixels of every polarity,
+indexed as `(p * height + y) * width + x`. The binning of a chunk is a single `np.bincount`, and only the last,
+incomplete frame is carried over to the next chunk, so recordings of any size are processed in bounded memory.
+
+Supported file formats:
+
+* `'npy'` - NumPy file with a structured array with the fields `t`, `x`, `y` and `p`, read with memory mapping,
+* `'raw'` - binary file of records of the given structured dtype, e.g. :data:`EVENT_DTYPE`,
+* `'atis'` - 40-bit ATIS events of N-MNIST and N-Caltech101 (8-bit x, 8-bit y, 1-bit polarity and 23-bit
+  timestamp in microseconds). As in the reference reader of the datasets, the events with y == 240 mark timestamp
+  overflows: each of them adds 2**13 us to the timestamps of the following events and is removed from the stream.
+
+Events outside of the sensor, i.e. with `x >= width`, `y >= height` or a polarity other than 0 or 1, are dropped
+by the binning.
+
+Usage::
+
+    from neuroaikit.dataset import aer
+    dataset = aer.event_dataset(paths, width=34, height=34, bin_size=1000, timesteps=300, labels=labels,
+                                format='atis').batch(32)
+    model.fit(dataset)
+"""
+
+import numpy as np
+
+EVENT_DTYPE = np.dtype([('t', '<i8'), ('x', '<u2'), ('y', '<u2'), ('p', 'u1')])
+_ATIS_OVERFLOW_Y = 240
+_ATIS_OVERFLOW_INCREMENT = 1 << 13
+
+
+def _decode_atis(data):
+    data = data.reshape(-1, 5).astype(np.int64)
+    events = np.empty(len(data), dtype=EVENT_DTYPE)
+    events['x'] = data[:, 0]
+    events['y'] = data[:, 1]
+    events['p'] = data[:, 2] >> 7
+    events['t'] = ((data[:, 2] & 0x7F) << 16) | (data[:, 3] << 8) | data[:, 4]
+    return events
+
+
+def read_events(path, format='npy', chunk_size=1 << 20, dtype=EVENT_DTYPE):
+    """Reads the events of a recording in chunks.
+
+    :param path: path of the recording
+    :param format: 'npy', 'raw' or 'atis', defaults to 'npy'
+    :param chunk_size: number of events per chunk, defaults to 2**20
+    :param dtype: structured dtype of the events of the 'raw' format, defaults to EVENT_DTYPE
+    :return: generator of structured arrays with the fields t, x, y and p
+    """
+    if format == 'npy':
+        events = np.load(path, mmap_mode='r')
+        for start in range(0, len(events), chunk_size):
+            yield np.asarray(events[start:start + chunk_size])
+    elif format == 'raw':
+        with open(path, 'rb') as f:
+            while True:
+                events = np.fromfile(f, dtype=dtype, count=chunk_size)
+                if len(events) == 0:
+                    break
+                yield events
+    elif format == 'atis':
+        overflows = 0
+        with open(path, 'rb') as f:
+            while True:
+                events = np.fromfile(f, dtype=np.uint8, count=5 * chunk_size)
+                if len(events) < 5:
+                    break
+                events = _decode_atis(events[:len(events) // 5 * 5])
+                # apply and remove the timestamp overflow markers
+                markers = events['y'] == _ATIS_OVERFLOW_Y
+                events['t'] += (overflows + np.cumsum(markers)) * _ATIS_OVERFLOW_INCREMENT
+                overflows += int(np.count_nonzero(markers))
+                events = events[~markers]
+                if len(events) > 0:
+                    yield events
+    else:
+        raise ValueError('Unknown event file format: {}'.format(format))
+
+
+class EventBinner:
+    """Bins a stream of time-sorted event chunks into spike frames.
+
+    :param width: sensor width in pixels
+    :param height: sensor height in pixels
+    :param bin_size: duration of a frame in the time units of the events
+    :param downsample: spatial downsampling factor, defaults to 1. Events of `downsample` x `downsample`
+        pixel blocks are merged.
+    :param polarity: bool, defaults to True. If True, the polarities are separate features, otherwise merged.
+    :param binary: bool, defaults to True. If True, the frames contain uint8 spikes (at least one event),
+        otherwise int32 event counts.
+    :param t_start: time of the start of the first frame, defaults to None (time of the first event)
+    :param max_frames: maximum number of frames binned at once, which bounds the memory, defaults to 1024
+
+    Events outside of the sensor, i.e. with `x >= width`, `y >= height` or a polarity other than 0 or 1,
+    are dropped.
+    """
+
+    def __init__(self, width, height, bin_size, downsample=1, polarity=True, binary=True, t_start=None,
+                 max_frames=1024):
+        """Constructor method"""
+        self.sensor_width = width
+        self.sensor_height = height
+        self.width = -(-width // downsample)
+        self.height = -(-height // downsample)
+        self.bin_size = bin_size
+        self.downsample = downsample
+        self.polarity = polarity
+        self.binary = binary
+        self.features = self.width * self.height * (2 if polarity else 1)
+        self.t_start = t_start
+        self.max_frames = max_frames
+        self.bin = 0
+        self.pending = np.zeros(self.features, dtype=np.int64)
+
+    def _finish(self, frames):
+        if self.binary:
+            return (frames > 0).astype(np.uint8)
+        return frames.astype(np.int32)
+
+    def push(self, events):
+        """Bins a chunk of events.
+
+        :param events: structured array with the fields t, x, y and p, sorted by time
+        :return: generator of arrays [frames, features] with at most `max_frames` frames completed by the chunk
+        """
+        valid = (events['x'] >= 0) & (events['x'] < self.sensor_width) & (events['y'] >= 0) \
+            & (events['y'] < self.sensor_height) & ((events['p'] == 0) | (events['p'] == 1))
+        if not np.all(valid):
+            events = events[valid]
+        if len(events) == 0:
+            return
+        if self.t_start is None:
+            self.t_start = int(events['t'][0])
+        bins = (events['t'].astype(np.int64) - self.t_start) // self.bin_size
+        if bins[0] < self.bin or np.any(bins[1:] < bins[:-1]):
+            raise ValueError('The events must be sorted by time')
+        features = (events['y'].astype(np.int64) // self.downsample) * self.width \
+            + events['x'].astype(np.int64) // self.downsample
+        if self.polarity:
+            features += events['p'].astype(np.int64) * (self.width * self.height)
+        start = 0
+        while start < len(events):
+            end = start + int(np.searchsorted(bins[start:], self.bin + self.max_frames))
+            if end == start:
+                # no events until the next block of frames, i.e. the frames of the current block are complete
+                frames = np.zeros((self.max_frames, self.features), dtype=np.int64)
+                frames[0] = self.pending
+                self.pending = np.zeros(self.features, dtype=np.int64)
+                self.bin += self.max_frames
+                yield self._finish(frames)
+                continue
+            count = int(bins[end - 1]) - self.bin + 1
+            frames = np.bincount((bins[start:end] - self.bin) * self.features + features[start:end],
+                                 minlength=count * self.features).reshape(count, self.features)
+            frames[0] += self.pending
+            self.pending = frames[-1].copy()
+            self.bin += count - 1
+            if count > 1:
+                yield self._finish(frames[:-1])
+            start = end
+
+    def flush(self):
+        """Returns the last, incomplete frame and resets the binner.
+
+        :return: array [1, features]
+        """
+        frame = self.pending[np.newaxis]
+        self.pending = np.zeros(self.features, dtype=np.int64)
+        self.bin += 1
+        return self._finish(frame)
+
+
+def stream_frames(path, width, height, bin_size, downsample=1, polarity=True, binary=True, format='npy',
+                  chunk_size=1 << 20):
+    """Streams a recording as spike frames, chunk by chunk.
+
+    :param path: path of the recording
+    :param width: sensor width in pixels
+    :param height: sensor height in pixels
+    :param bin_size: duration of a frame in the time units of the events
+    :param downsample: spatial downsampling factor, defaults to 1
+    :param polarity: bool, defaults to True. If True, the polarities are separate features.
+    :param binary: bool, defaults to True. If True, the frames contain spikes, otherwise event counts.
+    :param format: 'npy', 'raw' or 'atis', defaults to 'npy'
+    :param chunk_size: number of events per chunk, defaults to 2**20
+    :return: generator of arrays [frames, features]
+    """
+    binner = EventBinner(width, height, bin_size, downsample, polarity, binary)
+    for events in read_events(path, format, chunk_size):
+        yield from binner.push(events)
+    if binner.t_start is not None:
+        yield binner.flush()
+
+
+def stream_sequences(path, timesteps, *args, **kwargs):
+    """Streams a recording as consecutive non-overlapping sequences of spike frames. The last incomplete
+    sequence is padded with zero frames.
+
+    :param path: path of the recording
+    :param timesteps: number of frames per sequence
+    :param args: arguments of :func:`stream_frames`
+    :param kwargs: keyword arguments of :func:`stream_frames`
+    :return: generator of arrays [timesteps, features]
+    """
+    buffer, buffered = [], 0
+    for frames in stream_frames(path, *args, **kwargs):
+        buffer.append(frames)
+        buffered += len(frames)
+        if buffered >= timesteps:
+            frames = np.concatenate(buffer)
+            complete = len(frames) // timesteps * timesteps
+            yield from frames[:complete].reshape(-1, timesteps, frames.shape[1])
+            buffer, buffered = [frames[complete:]], len(frames) - complete
+    if buffered:
+        frames = np.concatenate(buffer)
+        yield np.concatenate([frames, np.zeros((timesteps - len(frames), frames.shape[1]), frames.dtype)])
+
+
+def event_dataset(paths, width, height, bin_size, timesteps, labels=None, downsample=1, polarity=True,
+                  binary=True, format='npy', chunk_size=1 << 20, parallel_files=4):
+    """Creates a `tf.data.Dataset` of spike frame sequences streamed from the recordings.
+
+    The recordings are read in parallel by `parallel_files` generators, each of them in chunks of events,
+    so that the dataset never holds a whole recording in memory.
+
+    :param paths: list of paths of the recordings
+    :param width: sensor width in pixels
+    :param height: sensor height in pixels
+    :param bin_size: duration of a frame in the time units of the events
+    :param timesteps: number of frames per sequence
+    :param labels: list with a label of every recording, defaults to None (no labels)
+    :param downsample: spatial downsampling factor, defaults to 1
+    :param polarity: bool, defaults to True. If True, the polarities are separate features.
+    :param binary: bool, defaults to True. If True, the frames contain spikes, otherwise event counts.
+    :param format: 'npy', 'raw' or 'atis', defaults to 'npy'
+    :param chunk_size: number of events per chunk, defaults to 2**20
+    :param parallel_files: number of recordings read in parallel, defaults to 4
+    :return: dataset yielding [timesteps, features] sequences or (sequence, label) pairs
+    """
+    import tensorflow as tf
+    binner = EventBinner(width, height, bin_size, downsample, polarity)
+    spec = tf.TensorSpec([timesteps, binner.features], tf.uint8 if binary else tf.int32)
+
+    def sequences(path):
+        return tf.data.Dataset.from_generator(
+            lambda path: stream_sequences(path.decode(), timesteps, width, height, bin_size, downsample,
+                                          polarity, binary, format, chunk_size),
+            output_signature=spec, args=(path,))
+
+    if labels is None:
+        return tf.data.Dataset.from_tensor_slices(list(paths)).interleave(
+            sequences, cycle_length=parallel_files, num_parallel_calls=tf.data.AUTOTUNE)
+    return tf.data.Dataset.from_tensor_slices((list(paths), labels)).interleave(
+        lambda path, label: sequences(path).map(lambda x: (x, label)),
+        cycle_length=parallel_files, num_parallel_calls=tf.data.AUTOTUNE)
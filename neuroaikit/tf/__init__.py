@@ -1,5 +1,20 @@
 """TensorFlow-specific functionality of the Neuro-inspired AI Toolkit.
+
+Submodules are imported lazily on first access, so that TensorFlow is imported only when it is used.
 """
 
-#import neuroaikit.tf.layers
-from . import layers
+from ..common.lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'activations': '.activations',
+    'layers': '.layers',
+    'pruning': '.pruning',
+    'online': '.online',
+    'streaming': '.streaming',
+    'export': '.export',
+    'generate': '.generate',
+    'profiling': '.profiling',
+    'data': '.data',
+    'scoring': '.scoring',
+    'regularizers': '.regularizers',
+})
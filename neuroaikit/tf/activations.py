@@ -4,6 +4,7 @@
 import tensorflow as tf
 
 
+@tf.keras.utils.register_keras_serializable(package='neuroaikit')
 def step_function(x, pseudoderivative_of=tf.nn.tanh):
     """Step function activation that in backward pass acts as if it was a function given in the
     `pseudoderivative_of` parameter.
@@ -17,7 +18,33 @@ def step_function(x, pseudoderivative_of=tf.nn.tanh):
     return pseudoderivative_of(x) + tf.stop_gradient(-pseudoderivative_of(x) + tf.nn.relu(tf.sign(x)))
 
 
+@tf.keras.utils.register_keras_serializable(package='neuroaikit')
 def leaky_rel(x, alpha=0.1):
     """Leaky_relu activation with alpha changed to 0.1 by default.
     """
     return tf.nn.leaky_relu(x, alpha=alpha)
+
+
+def serialize(activation):
+    """Serializes an activation function, e.g. for `get_config` of layers.
+
+    Besides Keras activations and the activations registered with `tf.keras.utils.register_keras_serializable`
+    (e.g. `step_function`, `leaky_rel`), supports tf.identity that is the default of SNU layers.
+
+    :param activation: activation function
+    :return: serialized activation
+    """
+    if activation is tf.identity:
+        return 'identity'
+    return tf.keras.activations.serialize(activation)
+
+
+def get(identifier):
+    """Retrieves an activation function serialized with `serialize`, or given by its Keras name.
+
+    :param identifier: serialized activation, name or function
+    :return: activation function
+    """
+    if identifier is None or identifier == 'identity':
+        return tf.identity
+    return tf.keras.activations.get(identifier)
@@ -0,0 +1,92 @@
+"""Input pipelines with spike-encoded datasets for single-device and distributed training.
+
+The examples are rate-encoded into spike trains on the fly (see also :func:`neuroaikit.common.utils.transform_rate`)
+with stateless random numbers seeded by the index of every example. The spikes of an example therefore do not
+depend on how the dataset is sharded, shuffled or batched, and every worker encodes only its own shard.
+
+Usage with `tf.distribute`::
+
+    import neuroaikit.tf as aitf
+    strategy = tf.distribute.MultiWorkerMirroredStrategy()
+    with strategy.scope():
+        model = ...
+    dataset = aitf.data.distributed_spike_dataset(strategy, x_train, y_train, timesteps=20,
+                                                 global_batch_size=256)
+    model.fit(dataset, epochs=10, steps_per_epoch=len(x_train) // 256)
+"""
+
+import tensorflow as tf
+
+
+def rate_encode(x, timesteps, max_is_present_for, seed):
+    """Encodes values into spike trains using rate coding.
+
+    :param x: Tensor [features] with values in range [0, 1]
+    :param timesteps: number of timesteps (length of the spike trains)
+    :param max_is_present_for: expected number of spikes for the maximum value of 1.0
+    :param seed: Tensor of shape [2] with the seed of the stateless random numbers
+    :return: uint8 Tensor [timesteps, features] with the spikes
+    """
+    x = tf.cast(x, tf.float32)
+    trials = tf.random.stateless_uniform(tf.concat([[timesteps], tf.shape(x)], 0), seed=seed)
+    return tf.cast(x * max_is_present_for / timesteps > trials, tf.uint8)
+
+
+def spike_dataset(inputs, labels, timesteps, batch_size, max_is_present_for=None, shuffle=None, seed=0,
+                  input_context=None, drop_remainder=None):
+    """Creates a dataset of rate-encoded spike trains.
+
+    :param inputs: array [examples, ...] with values in range [0, 1], e.g. images, flattened to features
+    :param labels: array [examples, ...] with the labels
+    :param timesteps: number of timesteps of the spike trains
+    :param batch_size: batch size, the per-replica batch size in distributed training
+    :param max_is_present_for: expected number of spikes for the maximum value, defaults to None (`timesteps`)
+    :param shuffle: size of the shuffle buffer, defaults to None (no shuffling)
+    :param seed: seed of the encoding and shuffling, defaults to 0
+    :param input_context: `tf.distribute.InputContext`, defaults to None. If given, the dataset is sharded
+        by the input pipeline, i.e. every worker reads and encodes only its own examples.
+    :param drop_remainder: bool, defaults to None (True in distributed training). If True, the last
+        incomplete batch is dropped, so that all replicas get batches of the same size.
+    :return: `tf.data.Dataset` yielding ([batch, timesteps, features] uint8, labels) batches
+    """
+    if max_is_present_for is None:
+        max_is_present_for = timesteps
+    if drop_remainder is None:
+        drop_remainder = input_context is not None
+    dataset = tf.data.Dataset.from_tensor_slices((inputs, labels)).enumerate()
+    if input_context is not None:
+        dataset = dataset.shard(input_context.num_input_pipelines, input_context.input_pipeline_id)
+    if shuffle:
+        dataset = dataset.shuffle(shuffle, seed=seed, reshuffle_each_iteration=True)
+
+    def encode(index, example):
+        x, y = example
+        spikes = rate_encode(tf.reshape(x, [-1]), timesteps, max_is_present_for,
+                             tf.stack([tf.cast(seed, tf.int64), index]))
+        return spikes, y
+
+    dataset = dataset.map(encode, num_parallel_calls=tf.data.AUTOTUNE)
+    dataset = dataset.batch(batch_size, drop_remainder=drop_remainder)
+    options = tf.data.Options()
+    # the dataset is sharded explicitly above
+    options.experimental_distribute.auto_shard_policy = tf.data.experimental.AutoShardPolicy.OFF
+    return dataset.with_options(options).prefetch(tf.data.AUTOTUNE)
+
+
+def distributed_spike_dataset(strategy, inputs, labels, timesteps, global_batch_size, **kwargs):
+    """Creates a distributed dataset of rate-encoded spike trains, in which every input pipeline
+    (e.g. every worker of `MultiWorkerMirroredStrategy`) reads and encodes its own shard of the examples.
+
+    :param strategy: `tf.distribute.Strategy`
+    :param inputs: array [examples, ...] with values in range [0, 1]
+    :param labels: array [examples, ...] with the labels
+    :param timesteps: number of timesteps of the spike trains
+    :param global_batch_size: batch size summed over all replicas
+    :param kwargs: other arguments of :func:`spike_dataset`
+    :return: `tf.distribute.DistributedDataset`
+    """
+    def dataset_fn(input_context):
+        batch_size = input_context.get_per_replica_batch_size(global_batch_size)
+        return spike_dataset(inputs, labels, timesteps, batch_size, input_context=input_context, **kwargs)
+
+    return strategy.distribute_datasets_from_function(dataset_fn)
@@ -0,0 +1,129 @@
+"""Export of SNU models to SavedModel and TFLite with a whole-sequence and a single-step signature.
+
+The exported models have two signatures:
+
+* `serving_default` - takes `inputs` [batch, time, features] and returns `outputs` for the whole sequence,
+* `step` - takes `inputs` [batch, features] of one timestep together with the states of all RNN layers
+  (`state_<layer>_<index>`, e.g. out and Vm of SNU layers) and returns `outputs` and the new states.
+
+In TFLite, the `step` signature uses only builtin ops, while the loop over time of `serving_default` requires
+the Flex delegate (select TensorFlow ops).
+
+Usage::
+
+    import neuroaikit.tf as aitf
+    aitf.export.export(model, 'exported_model', tflite_path='model.tflite')
+
+The signatures of the SavedModel are available with `tf.saved_model.load`. With Keras 2 (`tf_keras`), the SavedModel
+is also loaded back as a Keras model with `tf.keras.models.load_model` after
+:func:`neuroaikit.tf.layers.register_all`, see :func:`check_load`.
+"""
+
+import os
+import subprocess
+import sys
+import tensorflow as tf
+from .layers import register_all
+from .streaming import check_steppable, get_initial_states, step
+
+_KERAS_3 = hasattr(tf.keras, 'version') and tf.keras.version().startswith('3.')
+
+# loads a saved model in a fresh interpreter that knows nothing about the layers except through register_all
+_CHECK_LOAD_SCRIPT = '''
+import sys
+import tensorflow as tf
+import neuroaikit.tf as aitf
+aitf.layers.register_all()
+path = sys.argv[1]
+if path.endswith(('.keras', '.h5')) or not {keras_3}:
+    tf.keras.models.load_model(path, compile=False)
+if not path.endswith(('.keras', '.h5')):
+    tf.saved_model.load(path)
+'''
+
+
+def _state_names(model):
+    initial_states = get_initial_states(model, 1)
+    return [['state_{}_{}'.format(layer, i) for i in range(len(states))]
+            for layer, states in enumerate(initial_states)]
+
+
+def make_signatures(model):
+    """Creates the `serving_default` and `step` concrete functions of the model.
+
+    :param model: built Keras Sequential model with a fixed number of input features
+    :return: dict with the signatures
+    """
+    check_steppable(model)
+    features = model.input_shape[-1]
+    dtype = model.dtype or tf.float32
+    names = _state_names(model)
+    sizes = [[int(s.shape[-1]) for s in states] for states in get_initial_states(model, 1)]
+
+    @tf.function(input_signature=[tf.TensorSpec([None, None, features], dtype, name='inputs')])
+    def sequence(inputs):
+        return {'outputs': model(inputs, training=False)}
+
+    state_specs = [tf.TensorSpec([None, size], dtype, name=name)
+                   for layer_names, layer_sizes in zip(names, sizes) for name, size in zip(layer_names, layer_sizes)]
+
+    @tf.function(input_signature=[tf.TensorSpec([None, features], dtype, name='inputs')] + state_specs)
+    def single_step(inputs, *flat_states):
+        states, index = [], 0
+        for layer_names in names:
+            states.append(list(flat_states[index:index + len(layer_names)]))
+            index += len(layer_names)
+        outputs, new_states = step(model, inputs, states)
+        result = {'outputs': outputs}
+        for layer_names, layer_states in zip(names, new_states):
+            result.update(zip(layer_names, layer_states))
+        return result
+
+    return {'serving_default': sequence.get_concrete_function(), 'step': single_step.get_concrete_function()}
+
+
+def check_load(path):
+    """Checks that a saved model (`.keras`, `.h5` or a SavedModel directory) is loaded in a fresh interpreter
+    that only imports `neuroaikit.tf` and calls :func:`neuroaikit.tf.layers.register_all`.
+
+    :param path: path of the saved model
+    :raises RuntimeError: if the model cannot be loaded
+    """
+    package_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    python_path = [package_root] + os.environ.get('PYTHONPATH', '').split(os.pathsep)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(python_path))
+    result = subprocess.run([sys.executable, '-c', _CHECK_LOAD_SCRIPT.format(keras_3=_KERAS_3), path], env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    if result.returncode != 0:
+        raise RuntimeError('The model {} cannot be loaded in a fresh interpreter:\n{}'.format(path, result.stderr))
+
+
+def export(model, path, tflite_path=None, select_tf_ops=True, check=True):
+    """Exports the model to a SavedModel and optionally to a TFLite model, both with the `serving_default`
+    and `step` signatures.
+
+    :param model: built Keras Sequential model with a fixed number of input features
+    :param path: directory of the SavedModel
+    :param tflite_path: path of the TFLite model, defaults to None (no TFLite export)
+    :param select_tf_ops: bool, defaults to True. If True, TensorFlow ops without TFLite builtin counterparts
+        are allowed in the TFLite model (requires the Flex delegate in the interpreter).
+    :param check: bool, defaults to True. If True, the SavedModel is loaded in a fresh interpreter with
+        :func:`check_load`.
+    :return: path of the SavedModel
+    """
+    register_all()
+    signatures = make_signatures(model)
+    if _KERAS_3:
+        # Keras 3 saves only `.keras` files, the SavedModel is written by TensorFlow
+        tf.saved_model.save(model, path, signatures=signatures)
+    else:
+        model.save(path, save_format='tf', signatures=signatures)
+    if check:
+        check_load(path)
+    if tflite_path is not None:
+        converter = tf.lite.TFLiteConverter.from_saved_model(path, signature_keys=['serving_default', 'step'])
+        if select_tf_ops:
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS, tf.lite.OpsSet.SELECT_TF_OPS]
+        with open(tflite_path, 'wb') as f:
+            f.write(converter.convert())
+    return path
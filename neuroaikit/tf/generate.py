@@ -0,0 +1,98 @@
+"""Autoregressive generation of sequences with SNU models.
+
+The model is evaluated one timestep at a time with :mod:`neuroaikit.tf.streaming`, keeping the `(out, Vm)` states
+of its SNU layers between the timesteps, and its output is fed back as the next input. Generating a sequence is
+therefore linear in its length, instead of quadratic when the entire prefix is evaluated again in every timestep.
+Many sequences are generated in parallel as one batch.
+
+Usage (JSB model that outputs note logits)::
+
+    import neuroaikit.tf as aitf
+    songs, lengths = aitf.generate.generate(model, prime=song[:8], length=100, num_sequences=1000,
+                                            temperature=1.0)
+"""
+
+import numpy as np
+import tensorflow as tf
+from .streaming import check_steppable, get_initial_states, step
+
+
+def sample(logits, temperature=None, threshold=0.0, generator=None):
+    """Converts output logits into binary outputs, e.g. notes or spikes.
+
+    :param logits: Tensor [batch, features] with logits of independent binary outputs
+    :param temperature: float, defaults to None. If None, the logits are thresholded. Otherwise, every output
+        is sampled with probability sigmoid(logits / temperature).
+    :param threshold: threshold of the logits used when `temperature` is None, defaults to 0.0
+    :param generator: `tf.random.Generator` used for sampling, defaults to None (global generator)
+    :return: Tensor [batch, features] with 0.0 or 1.0 values
+    """
+    if temperature is None:
+        return tf.cast(logits > threshold, logits.dtype)
+    if generator is None:
+        generator = tf.random.get_global_generator()
+    probabilities = tf.sigmoid(logits / temperature)
+    return tf.cast(generator.uniform(tf.shape(probabilities), dtype=probabilities.dtype) < probabilities,
+                   logits.dtype)
+
+
+def generate(model, prime, length, num_sequences=None, temperature=None, threshold=0.0, stop=None, seed=None):
+    """Generates sequences autoregressively, feeding back the sampled outputs as the next inputs.
+
+    The prime sequence is processed first to set the states, then `length` timesteps are generated. A sequence
+    ends at the first generated timestep for which `stop` is True; that timestep and the following ones are
+    zeros in the result. The generation finishes early when all sequences have ended.
+
+    :param model: Keras Sequential model whose output has the same number of features as its input,
+        e.g. logits of the next timestep
+    :param prime: array [time, features] shared by all sequences or [batch, time, features] with at least
+        one timestep
+    :param length: number of timesteps to generate
+    :param num_sequences: number of sequences generated from a shared prime, defaults to None (1 sequence)
+    :param temperature: sampling temperature, defaults to None (thresholding). See :func:`sample`.
+    :param threshold: threshold of the logits used when `temperature` is None, defaults to 0.0
+    :param stop: function that takes the generated Tensor [batch, features] of a timestep and returns
+        a bool Tensor [batch] marking the sequences that end, e.g. `lambda x: tf.reduce_sum(x, -1) == 0`,
+        defaults to None (sequences end after `length` timesteps)
+    :param seed: seed of the sampling, defaults to None (non-deterministic)
+    :return: (sequences, lengths) tuple with NumPy arrays [batch, length, features] and [batch]
+    """
+    check_steppable(model)
+    prime = tf.convert_to_tensor(prime, tf.float32)
+    if prime.shape.rank == 2:
+        prime = tf.tile(prime[tf.newaxis], [num_sequences or 1, 1, 1])
+    elif num_sequences is not None and num_sequences != prime.shape[0]:
+        raise ValueError('num_sequences must match the batch size of the prime sequences')
+    if prime.shape[1] == 0:
+        raise ValueError('The prime sequence must have at least one timestep')
+    if seed is None:
+        generator = tf.random.Generator.from_non_deterministic_state()
+    else:
+        generator = tf.random.Generator.from_seed(seed)
+    batch_size = prime.shape[0]
+
+    @tf.function
+    def run(prime, length):
+        states = get_initial_states(model, batch_size)
+        logits = tf.zeros([batch_size, prime.shape[2]])
+        for t in tf.range(tf.shape(prime)[1]):
+            logits, states = step(model, prime[:, t], states)
+        outputs = tf.TensorArray(tf.float32, size=0, dynamic_size=True, element_shape=logits.shape)
+        done = tf.zeros([batch_size], tf.bool)
+        lengths = tf.zeros([batch_size], tf.int32)
+        for t in tf.range(length):
+            x = sample(logits, temperature, threshold, generator)
+            if stop is not None:
+                done = tf.logical_or(done, stop(x))
+            x = tf.where(done[:, tf.newaxis], tf.zeros_like(x), x)
+            lengths += tf.cast(tf.logical_not(done), tf.int32)
+            outputs = outputs.write(t, x)
+            if tf.reduce_all(done):
+                break
+            logits, states = step(model, x, states)
+        return outputs.stack(), lengths
+
+    outputs, lengths = run(prime, tf.constant(length))
+    sequences = np.zeros((batch_size, length, prime.shape[2]), dtype=np.float32)
+    sequences[:, :outputs.shape[0]] = np.transpose(outputs.numpy(), (1, 0, 2))
+    return sequences, lengths.numpy()
@@ -1,8 +1,37 @@
 """Layers provided by Neuro-inspired AI Toolkit.
+
+Layers are imported lazily on first access, so that TensorFlow is imported only when it is used. A layer is
+registered for Keras deserialization only when its module is imported, so saved models are loaded after
+:func:`register_all`::
+
+    import neuroaikit.tf as aitf
+    aitf.layers.register_all()
+    model = tf.keras.models.load_model('model.keras')
 """
 
-#from neuroaikit.tf.layers.snubasiccell import SNUBasicCell
+from ...common.lazy import lazy_attributes
+
+_LAYERS = {
+    'SNUBasicCell': '.snubasiccell',
+    'SNULICell': '.snulicell',
+    'SNUSparseCell': '.snusparsecell',
+    'SNUScan': '.snuscan',
+    'SNU': '.snu',
+    'TemporalPooling': '.temporalpooling',
+    'ClockDividedRNN': '.clockdividedrnn',
+    'SNURNN': '.snurnn',
+}
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAYERS)
+
+
+def register_all():
+    """Imports all layers, which registers them, together with the activations and regularizers they use,
+    for Keras deserialization. Must be called before loading a saved model (`.keras`, SavedModel or H5)
+    in a process that has not created the layers yet.
 
-from .snubasiccell import SNUBasicCell
-from .snulicell import SNULICell
-from .snu import SNU
\ No newline at end of file
+    :return: dict mapping the names of the layers to their classes, e.g. for the `custom_objects` argument
+        of `tf.keras.models.load_model`
+    """
+    from .. import regularizers  # registers FiringRateRegularizer used by rate_regularizer
+    return {name: __getattr__(name) for name in _LAYERS}
@@ -0,0 +1,52 @@
+"""Contains RNN layer running at a divided clock.
+"""
+
+from neuroaikit.tf.activations import *
+from .temporalpooling import temporal_pool, temporal_pool_mask
+from .snurnn import SNURNN
+
+
+@tf.keras.utils.register_keras_serializable(package='neuroaikit')
+class ClockDividedRNN(SNURNN):
+    """This is an RNN layer, e.g. with an SNU cell, that ticks once every `clock_divider` input timesteps.
+
+    The input is pooled over windows of `clock_divider` timesteps with :func:`temporal_pool`, so that the cell is
+    evaluated `time / clock_divider` times and the output sequence (if `return_sequences=True`) is shorter
+    by the same factor. The decay of the cell applies per tick, e.g. `decay ** clock_divider` keeps
+    the membrane time constant of the undivided layer.
+
+    :param cell: RNN cell, e.g. SNUBasicCell
+    :param clock_divider: number of input timesteps per tick, defaults to 1
+    :param pooling: 'sum' or 'or' pooling of the input spikes of a window, defaults to 'sum'
+    :param kwargs: Additional arguments of `SNURNN` (e.g. rate_regularizer, return_sequences, name)
+    """
+
+    def __init__(self, cell, clock_divider=1, pooling='sum', **kwargs):
+        """Constructor method"""
+        super(ClockDividedRNN, self).__init__(cell, **kwargs)
+        self.clock_divider = clock_divider
+        self.pooling = pooling
+
+    def get_config(self):
+        """Returns the configuration of the layer for serialization"""
+        config = super(ClockDividedRNN, self).get_config()
+        config.update({'clock_divider': self.clock_divider, 'pooling': self.pooling})
+        return config
+
+    def call(self, sequences, initial_state=None, mask=None, training=None, **kwargs):
+        """Overriding call method that pools the input before the RNN loop"""
+        if self.clock_divider > 1:
+            sequences = temporal_pool(sequences, self.clock_divider, self.pooling)
+            mask = temporal_pool_mask(mask, self.clock_divider)
+        return super(ClockDividedRNN, self).call(sequences, initial_state=initial_state, mask=mask, training=training,
+                                                 **kwargs)
+
+    def compute_mask(self, inputs, mask):
+        return super(ClockDividedRNN, self).compute_mask(inputs, temporal_pool_mask(mask, self.clock_divider))
+
+    def compute_output_shape(self, sequences_shape, *args, **kwargs):
+        timesteps = sequences_shape[1]
+        if timesteps is not None:
+            timesteps = -(-timesteps // self.clock_divider)
+        sequences_shape = (sequences_shape[0], timesteps) + tuple(sequences_shape[2:])
+        return super(ClockDividedRNN, self).compute_output_shape(sequences_shape, *args, **kwargs)
@@ -0,0 +1,70 @@
+"""Contains operations that keep spikes compactly for the backward pass of SNU cells.
+
+In the backward pass of `tf.keras.layers.RNN`, TensorFlow keeps for every timestep the tensors needed by
+the gradients of the cell operations, e.g. the float32 inputs of matrix multiplications. The operations below
+compute the same values and gradients as their standard counterparts, but keep the spikes as uint8/bool tensors,
+i.e. 4x less memory, and convert them back to floats only in the backward pass.
+
+The spikes must be binary, i.e. 0.0 or 1.0.
+"""
+
+import tensorflow as tf
+
+
+def spike_matmul(spikes, kernel):
+    """Matrix multiplication `spikes @ kernel` that keeps the spikes as uint8 for the backward pass.
+
+    :param spikes: Tensor [batch, inputs] with binary spikes
+    :param kernel: Tensor or variable [inputs, units]
+    :return: Tensor [batch, units]
+    """
+    # Keras 3 variables are not tf.Variable, so they must be read before entering the custom gradient
+    return _spike_matmul(spikes, tf.convert_to_tensor(kernel))
+
+
+@tf.custom_gradient
+def _spike_matmul(spikes, kernel):
+    packed = tf.cast(spikes, tf.uint8)
+
+    def grad(d_out):
+        return tf.matmul(d_out, kernel, transpose_b=True), tf.matmul(tf.cast(packed, d_out.dtype), d_out,
+                                                                     transpose_a=True)
+
+    return tf.matmul(spikes, kernel), grad
+
+
+@tf.custom_gradient
+def spike_reset(Vm, spikes):
+    """Reset of the membrane potential `Vm * (1 - spikes)` that keeps the spikes as bool for the backward pass.
+
+    :param Vm: Tensor with the membrane potential
+    :param spikes: Tensor with binary spikes
+    :return: Tensor with the membrane potential after the reset
+    """
+    packed = tf.cast(spikes, tf.bool)
+
+    def grad(d_out):
+        return tf.where(packed, tf.zeros_like(d_out), d_out), -d_out * Vm
+
+    return tf.where(packed, tf.zeros_like(Vm), Vm), grad
+
+
+@tf.custom_gradient
+def spike_max_reset(Vm, spikes):
+    """Lateral-inhibition reset of the membrane potential `Vm * (1 - reduce_max(spikes, axis=-1, keepdims=True))`
+    that keeps the spikes as bool for the backward pass.
+
+    :param Vm: Tensor [batch, units] with the membrane potential
+    :param spikes: Tensor [batch, units] with binary spikes
+    :return: Tensor [batch, units] with the membrane potential after the reset of the samples with any spike
+    """
+    packed = tf.cast(spikes, tf.bool)
+    fired = tf.reduce_any(packed, axis=-1, keepdims=True)
+
+    def grad(d_out):
+        # as in the gradient of reduce_max, the gradient is split evenly between the spikes equal to the maximum
+        ties = tf.cast(tf.equal(packed, fired), d_out.dtype)
+        d_max = -tf.reduce_sum(d_out * Vm, axis=-1, keepdims=True)
+        return tf.where(fired, tf.zeros_like(d_out), d_out), d_max * ties / tf.reduce_sum(ties, axis=-1, keepdims=True)
+
+    return tf.where(fired, tf.zeros_like(Vm), Vm), grad
@@ -4,9 +4,16 @@
 from neuroaikit.tf.activations import *
 from .snubasiccell import SNUBasicCell
 from .snulicell import SNULICell
+from .snuscan import SNUScan
+from .clockdividedrnn import ClockDividedRNN
+from .snurnn import SNURNN
 
 def SNU(units, activation=step_function, decay=0.8, g=tf.identity, recurrent=False,
         lateral_inhibition=False, #uses SNULICell
+        recurrent_rank=None, input_rank=None, diagonal=False, compact_spikes=False,
+        parallel_scan=False, reset_iterations=1, #uses SNUScan
+        clock_divider=1, pooling='sum', #uses ClockDividedRNN
+        rate_regularizer=None, #uses SNURNN
         **args):
     """This is a basic SNU layer.
 
@@ -18,10 +25,39 @@ def SNU(units, activation=step_function, decay=0.8, g=tf.identity, recurrent=Fal
         defaults to tf.identity (no constraint)
     :param recurrent: bool, defaults to False. If True, SNU includes recurrent connections inside entire layer.
     :param lateral_inhibition: bool, defaults to False. If True, layer-wise lateral inhibition is used.
+    :param recurrent_rank: int, defaults to None (full matrix). If set, the recurrent weights are factorized as
+        U V^T with rank `recurrent_rank`.
+    :param input_rank: int, defaults to None (full matrix). If set, the input weights are factorized as U V^T.
+    :param diagonal: bool, defaults to False. If True, a per-unit self-connection is added to the factorized
+        recurrent weights. Requires recurrent=True and recurrent_rank.
+    :param compact_spikes: bool, defaults to False. If True, spikes are kept for the backward pass as uint8/bool,
+        which reduces the activation memory. Requires binary input spikes and a binary activation.
+    :param parallel_scan: bool, defaults to False. If True, the layer is computed with a parallel scan over time
+        using SNUScan with a linearized reset. Supported only for the basic feed-forward SNU with g=tf.identity.
+    :param reset_iterations: int, defaults to 1. Number of scan passes refining the reset when parallel_scan=True.
+    :param clock_divider: int, defaults to 1. If greater than 1, the layer ticks once every `clock_divider` input
+        timesteps on the pooled input and outputs `time / clock_divider` timesteps. See ClockDividedRNN.
+    :param pooling: 'sum' or 'or' pooling of the input spikes when clock_divider > 1, defaults to 'sum'
+    :param rate_regularizer: Regularizer of the firing rates [batch, units] of the layer, e.g. FiringRateRegularizer,
+        defaults to None (no regularization). The spikes are counted inside the RNN loop. See SNURNN.
     :param args: Additional arguments to the Keras layer constructor (e.g. name, trainable).
     :return:
     """
+    if parallel_scan:
+        if (recurrent or lateral_inhibition or g is not tf.identity or recurrent_rank is not None
+                or input_rank is not None or diagonal or compact_spikes or clock_divider != 1):
+            raise ValueError('parallel_scan supports only the basic feed-forward SNU with g=tf.identity')
+        return SNUScan(units, activation=activation, decay=decay, reset_iterations=reset_iterations,
+                       rate_regularizer=rate_regularizer, **args)
     cell = SNUBasicCell
     if lateral_inhibition:
         cell = SNULICell
-    return tf.keras.layers.RNN(cell(units, activation=activation, decay=decay, g=g, recurrent=recurrent), **args)
+    cell = cell(units, activation=activation, decay=decay, g=g, recurrent=recurrent, recurrent_rank=recurrent_rank,
+                input_rank=input_rank, diagonal=diagonal, compact_spikes=compact_spikes,
+                count_spikes=rate_regularizer is not None)
+    if clock_divider != 1:
+        return ClockDividedRNN(cell, clock_divider=clock_divider, pooling=pooling, rate_regularizer=rate_regularizer,
+                               **args)
+    if rate_regularizer is not None:
+        return SNURNN(cell, rate_regularizer=rate_regularizer, **args)
+    return tf.keras.layers.RNN(cell, **args)
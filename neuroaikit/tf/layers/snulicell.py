@@ -2,7 +2,11 @@
 """
 
 from neuroaikit.tf.activations import *
+from neuroaikit.tf import activations
+from neuroaikit.tf.profiling import annotate
+from .compact import spike_matmul, spike_max_reset
 
+@tf.keras.utils.register_keras_serializable(package='neuroaikit')
 class SNULICell(tf.keras.layers.Layer):
     """This is a lateral inhibition SNU cell.
 
@@ -13,26 +17,68 @@ class SNULICell(tf.keras.layers.Layer):
     :param g: Internal state activation function that optionally constraints the state,
         defaults to tf.identity (no constraint)
     :param recurrent: bool, defaults to False. If True, SNU includes recurrent connections inside entire layer.
+    :param recurrent_rank: int, defaults to None (full matrix). If set, the recurrent weights are factorized as
+        U V^T with U, V of shape [units, recurrent_rank] and evaluated as two thin matrix multiplications.
+    :param input_rank: int, defaults to None (full matrix). If set, the input weights are factorized as U V^T.
+    :param diagonal: bool, defaults to False. If True, a per-unit self-connection is added to the factorized
+        recurrent weights, i.e. U V^T + diag(d). Requires recurrent=True and recurrent_rank.
+    :param compact_spikes: bool, defaults to False. If True, the input and output spikes are kept for the backward
+        pass as uint8/bool instead of float32, which reduces the activation memory. Requires binary input spikes
+        and a binary activation such as step_function.
+    :param count_spikes: bool, defaults to False. If True, the cell has a third state that accumulates the number
+        of spikes of every unit, e.g. for firing-rate regularization (see SNURNN).
     """
 
-    def __init__(self, units, decay=0.8, activation=step_function, g=tf.identity, recurrent=False, **kwargs):
+    def __init__(self, units, decay=0.8, activation=step_function, g=tf.identity, recurrent=False,
+                 recurrent_rank=None, input_rank=None, diagonal=False,
+                 compact_spikes=False, count_spikes=False, **kwargs):
         """Constructor method"""
-        super(self.__class__, self).__init__(**kwargs)
+        super(SNULICell, self).__init__(**kwargs)
+        if diagonal and not (recurrent and recurrent_rank is not None):
+            raise ValueError('diagonal requires recurrent=True and recurrent_rank to be set')
         self.units = units
-        self.state_size = (units, units)
+        self.state_size = (units, units, units) if count_spikes else (units, units)
         self.decay = decay
-        self.activation = activation
-        self.g = g
+        self.activation = activations.get(activation)
+        self.g = activations.get(g)
         self.recurrent = recurrent
+        self.recurrent_rank = recurrent_rank
+        self.input_rank = input_rank
+        self.diagonal = diagonal
+        self.compact_spikes = compact_spikes
+        self.count_spikes = count_spikes
+
+    def get_config(self):
+        """Returns the configuration of the cell for serialization"""
+        config = super(SNULICell, self).get_config()
+        config.update({'units': self.units, 'decay': self.decay,
+                       'activation': activations.serialize(self.activation), 'g': activations.serialize(self.g),
+                       'recurrent': self.recurrent, 'recurrent_rank': self.recurrent_rank,
+                       'input_rank': self.input_rank, 'diagonal': self.diagonal,
+                       'compact_spikes': self.compact_spikes, 'count_spikes': self.count_spikes})
+        return config
 
     def build(self, input_shape):
         """Overriding build method that creates the variables
 
         :param input_shape: Shape of the input
         """
-        self.kernel = self.add_weight(shape=(input_shape[-1], self.units), name='kernel')
+        if self.input_rank is None:
+            self.kernel = self.add_weight(shape=(input_shape[-1], self.units), name='kernel')
+        else:
+            self.kernel_u = self.add_weight(shape=(input_shape[-1], self.input_rank), name='kernel_u')
+            self.kernel_v = self.add_weight(shape=(self.units, self.input_rank), name='kernel_v')
         if self.recurrent:
-            self.recurrent_kernel = self.add_weight(shape=(self.units, self.units), name='recurrent_kernel')
+            if self.recurrent_rank is None:
+                self.recurrent_kernel = self.add_weight(shape=(self.units, self.units), name='recurrent_kernel')
+            else:
+                self.recurrent_kernel_u = self.add_weight(shape=(self.units, self.recurrent_rank),
+                                                          name='recurrent_kernel_u')
+                self.recurrent_kernel_v = self.add_weight(shape=(self.units, self.recurrent_rank),
+                                                          name='recurrent_kernel_v')
+                if self.diagonal:
+                    self.recurrent_diagonal = self.add_weight(shape=(self.units,), initializer='zeros',
+                                                              name='recurrent_diagonal')
         self.bias = self.add_weight(shape=(self.units,), initializer='ones', name='bias')
         self.built = True
 
@@ -43,17 +89,37 @@ class SNULICell(tf.keras.layers.Layer):
         :param states: Tuple with previous state values
         :return: Output values, State values.
         """
-        (out_prev, Vm_prev) = states
+        (out_prev, Vm_prev) = states[:2]
+        matmul = spike_matmul if self.compact_spikes else tf.matmul
 
-        #Vm = Vm_prev * (1.0 - out_prev)
-        #Lateral inhibition logic:
-        Vm = Vm_prev * (1.0 - tf.reduce_max(out_prev))
+        with annotate('reset'):
+            #Vm = Vm_prev * (1.0 - out_prev)
+            #Lateral inhibition logic, per sample so that the samples of a (per-replica) batch stay independent:
+            if self.compact_spikes:
+                Vm = spike_max_reset(Vm_prev, out_prev)
+            else:
+                Vm = Vm_prev * (1.0 - tf.reduce_max(out_prev, axis=-1, keepdims=True))
 
-        Vm = Vm * self.decay
-        Vm = Vm + tf.matmul(inputs, self.kernel)
+            Vm = Vm * self.decay
+        with annotate('input_matmul'):
+            if self.input_rank is None:
+                Vm = Vm + matmul(inputs, self.kernel)
+            else:
+                Vm = Vm + tf.matmul(matmul(inputs, self.kernel_u), self.kernel_v, transpose_b=True)
         if self.recurrent:
-            Vm = Vm + tf.matmul(out_prev, self.recurrent_kernel)
-        Vm = self.g(Vm)
-        overVth = Vm - self.bias
-        out = self.activation(overVth)
+            with annotate('recurrent_matmul'):
+                if self.recurrent_rank is None:
+                    Vm = Vm + matmul(out_prev, self.recurrent_kernel)
+                else:
+                    Vm = Vm + tf.matmul(matmul(out_prev, self.recurrent_kernel_u), self.recurrent_kernel_v,
+                                        transpose_b=True)
+                    if self.diagonal:
+                        Vm = Vm + out_prev * self.recurrent_diagonal
+        with annotate('g'):
+            Vm = self.g(Vm)
+        with annotate('activation'):
+            overVth = Vm - self.bias
+            out = self.activation(overVth)
+        if self.count_spikes:
+            return out, (out, Vm, states[2] + out)
         return out, (out, Vm)
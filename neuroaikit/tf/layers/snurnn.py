@@ -0,0 +1,81 @@
+"""Contains RNN layer that regularizes the firing rates of its SNU cell.
+"""
+
+from neuroaikit.tf.activations import *
+
+
+@tf.keras.utils.register_keras_serializable(package='neuroaikit')
+class SNURNN(tf.keras.layers.RNN):
+    """This is an RNN layer with an SNU cell that regularizes the firing rates of the units.
+
+    The cell must be created with `count_spikes=True`, so that the number of spikes of every unit is accumulated
+    inside the RNN loop as an additional state. After the loop, the firing rates [batch, units] are the spike counts
+    divided by the number of (unmasked) timesteps. The `rate_regularizer`, e.g.
+    :class:`~neuroaikit.tf.regularizers.FiringRateRegularizer`, is applied to them and added to the layer losses,
+    while the achieved mean rate is tracked during training by the metric `<name>_rate` (`rate_metric`).
+
+    :param cell: SNU cell created with count_spikes=True, e.g. SNUBasicCell
+    :param rate_regularizer: Regularizer of the firing rates, defaults to None (no regularization)
+    :param kwargs: Additional arguments of `tf.keras.layers.RNN` (e.g. return_sequences, name)
+    """
+
+    def __init__(self, cell, rate_regularizer=None, **kwargs):
+        """Constructor method"""
+        super(SNURNN, self).__init__(cell, **kwargs)
+        self.rate_regularizer = tf.keras.regularizers.get(rate_regularizer)
+        if self.rate_regularizer is not None and not getattr(cell, 'count_spikes', False):
+            raise ValueError('rate_regularizer requires a cell created with count_spikes=True')
+        self.rate_metric = None
+        if self.rate_regularizer is not None:
+            self.rate_metric = tf.keras.metrics.Mean(name=self.name + '_rate')
+
+    def get_config(self):
+        """Returns the configuration of the layer for serialization"""
+        config = super(SNURNN, self).get_config()
+        config.update({'rate_regularizer': tf.keras.regularizers.serialize(self.rate_regularizer)
+                       if self.rate_regularizer is not None else None})
+        return config
+
+    def _regularize_rates(self, counts, sequences, mask, training):
+        if mask is None:
+            steps = tf.cast(tf.shape(sequences)[1], counts.dtype)
+        else:
+            steps = tf.maximum(tf.reduce_sum(tf.cast(mask, counts.dtype), 1, keepdims=True), 1.0)
+        rates = counts / steps
+        self.add_loss(self.rate_regularizer(rates))
+        if training:  # the metric variables are not captured by inference graphs, e.g. exported signatures
+            self.rate_metric.update_state(tf.reduce_mean(rates))
+
+    def inner_loop(self, sequences, initial_state, mask, training=False):
+        """Overriding Keras 3 inner_loop method that regularizes the firing rates after the RNN loop"""
+        last_output, outputs, states = super(SNURNN, self).inner_loop(sequences, initial_state, mask,
+                                                                      training=training)
+        if self.rate_regularizer is not None:
+            # the counts continue from the initial state, e.g. from the previous batch of a stateful layer
+            counts = tf.nest.flatten(states)[-1] - tf.nest.flatten(initial_state)[-1]
+            self._regularize_rates(counts, sequences, mask, training)
+        return last_output, outputs, states
+
+    def call(self, sequences, initial_state=None, mask=None, training=None, **kwargs):
+        """Overriding call method that regularizes the firing rates after the RNN loop"""
+        # the arguments are passed by keyword, as the order differs between Keras 2 and Keras 3 `RNN.call`
+        kwargs.update(initial_state=initial_state, mask=mask, training=training)
+        if self.rate_regularizer is None or hasattr(tf.keras.layers.RNN, 'inner_loop'):
+            # Keras 3 runs the loop in `inner_loop`
+            return super(SNURNN, self).call(sequences, **kwargs)
+        # Keras 2 `RNN.call` has no loop hook, so it returns the final states for the duration of this call
+        if initial_state is not None:
+            initial_counts = tf.nest.flatten(initial_state)[-1]
+        elif self.stateful:
+            initial_counts = tf.identity(self.states[-1])
+        else:
+            initial_counts = 0.0
+        return_state, self.return_state = self.return_state, True
+        try:
+            outputs = super(SNURNN, self).call(sequences, **kwargs)
+        finally:
+            self.return_state = return_state
+        self._regularize_rates(outputs[-1] - initial_counts, sequences, mask, training)
+        if self.return_state:
+            return outputs
+        return outputs[0]
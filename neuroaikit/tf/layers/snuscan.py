@@ -0,0 +1,131 @@
+"""Contains SNU layer variant computed with a parallel scan over time.
+"""
+
+from neuroaikit.tf.activations import *
+from neuroaikit.tf import activations
+from neuroaikit.tf.profiling import annotate
+
+
+def _hillis_steele_scan(a, b):
+    timesteps = tf.shape(b)[1]
+
+    def body(offset, a, b):
+        # combine every element with the partial result `offset` steps earlier (identity: a=1, b=0)
+        padding = [[0, 0], [offset, 0], [0, 0]]
+        a_prev = tf.pad(a[:, :timesteps - offset], padding, constant_values=1.0)
+        b_prev = tf.pad(b[:, :timesteps - offset], padding)
+        return offset * 2, a * a_prev, a * b_prev + b
+
+    _, _, h = tf.while_loop(lambda offset, a, b: offset < timesteps, body, (tf.constant(1), a, b))
+    return h
+
+
+@tf.custom_gradient
+def linear_scan(a, b):
+    """Computes the linear recurrence h_t = a_t * h_{t-1} + b_t with h_{-1} = 0 along the time axis.
+
+    Uses the Hillis-Steele associative scan, i.e. O(log T) steps that each operate on the entire sequence,
+    instead of T sequential steps. The gradient is again a linear recurrence running backwards in time,
+    so it is computed with the same scan and only `a` and `h` are kept for the backward pass.
+
+    :param a: Tensor [batch, time, units] with the multiplicative coefficients
+    :param b: Tensor [batch, time, units] with the additive terms
+    :return: Tensor [batch, time, units] with h
+    """
+    h = _hillis_steele_scan(a, b)
+
+    def grad(dh):
+        # db_t = dh_t + a_{t+1} * db_{t+1} and da_t = db_t * h_{t-1}
+        a_next = tf.pad(a[:, 1:], [[0, 0], [0, 1], [0, 0]])
+        db = tf.reverse(_hillis_steele_scan(tf.reverse(a_next, [1]), tf.reverse(dh, [1])), [1])
+        h_prev = tf.pad(h[:, :-1], [[0, 0], [1, 0], [0, 0]])
+        return db * h_prev, db
+
+    return h, grad
+
+
+@tf.keras.utils.register_keras_serializable(package='neuroaikit')
+class SNUScan(tf.keras.layers.Layer):
+    """This is an SNU layer that processes entire sequences with a parallel scan.
+
+    The membrane potential recurrence is linear if the reset is not taken into account, so that it can be computed
+    with :func:`linear_scan` in O(log T) depth instead of O(T) steps of `tf.keras.layers.RNN`. The reset is
+    linearized: the spikes from the previous pass are treated as constants (detached reset) and define
+    the time-varying decay of the next pass. The layer is therefore a variant of `SNUBasicCell` with its own
+    dynamics that is meant to be trained as such: the spikes approach those of `SNUBasicCell` as
+    `reset_iterations` grows (and match them for `reset_iterations` >= T), at the cost of one scan per pass.
+
+    Only the basic feed-forward SNU is supported, i.e. without recurrent connections, lateral inhibition
+    and with g being the identity.
+
+    :param units: Number of units to create in the layer
+    :param decay: Membrane potential decay multiplier, defaults to 0.8,
+        i.e. 0.8 of the previous membrane potential is retained
+    :param activation: Activation function, defaults to step_function. See TF_Misc.Activations.
+    :param reset_iterations: int, defaults to 1. Number of scan passes that refine the reset, 0 disables the reset.
+    :param return_sequences: bool, defaults to False. If True, the entire output sequence is returned,
+        otherwise only the output in the last timestep.
+    :param rate_regularizer: Regularizer of the firing rates [batch, units], i.e. the output averaged over time,
+        defaults to None (no regularization). The mean rate is tracked during training by the metric `<name>_rate`.
+    """
+
+    def __init__(self, units, decay=0.8, activation=step_function, reset_iterations=1, return_sequences=False,
+                 rate_regularizer=None, **kwargs):
+        """Constructor method"""
+        super(SNUScan, self).__init__(**kwargs)
+        self.units = units
+        self.decay = decay
+        self.activation = activations.get(activation)
+        self.reset_iterations = reset_iterations
+        self.return_sequences = return_sequences
+        self.rate_regularizer = tf.keras.regularizers.get(rate_regularizer)
+        self.rate_metric = None
+        if self.rate_regularizer is not None:
+            self.rate_metric = tf.keras.metrics.Mean(name=self.name + '_rate')
+
+    def get_config(self):
+        """Returns the configuration of the layer for serialization"""
+        config = super(SNUScan, self).get_config()
+        config.update({'units': self.units, 'decay': self.decay,
+                       'activation': activations.serialize(self.activation),
+                       'reset_iterations': self.reset_iterations, 'return_sequences': self.return_sequences,
+                       'rate_regularizer': tf.keras.regularizers.serialize(self.rate_regularizer)
+                       if self.rate_regularizer is not None else None})
+        return config
+
+    def build(self, input_shape):
+        """Overriding build method that creates the variables
+
+        :param input_shape: Shape of the input
+        """
+        self.kernel = self.add_weight(shape=(input_shape[-1], self.units), name='kernel')
+        self.bias = self.add_weight(shape=(self.units,), initializer='ones', name='bias')
+        self.built = True
+
+    def call(self, inputs, training=None):
+        """Overriding call method that defines the layer dynamics' graph
+
+        :param inputs: Tensor [batch, time, inputs]
+        :param training: bool, the mean firing rate is tracked by `rate_metric` only in training
+        :return: Output values [batch, time, units] or [batch, units] depending on `return_sequences`
+        """
+        with annotate('input_matmul'):
+            inputs = tf.cast(inputs, self.kernel.dtype)
+            current = tf.einsum('bti,iu->btu', inputs, self.kernel)
+        with annotate('scan'):
+            decay = tf.fill(tf.shape(current), tf.cast(self.decay, current.dtype))
+            Vm = linear_scan(decay, current)
+            for _ in range(self.reset_iterations):
+                out = tf.stop_gradient(self.activation(Vm - self.bias))
+                out_prev = tf.pad(out[:, :-1], [[0, 0], [1, 0], [0, 0]])
+                Vm = linear_scan(decay * (1.0 - out_prev), current)
+        with annotate('activation'):
+            out = self.activation(Vm - self.bias)
+        if self.rate_regularizer is not None:
+            rates = tf.reduce_mean(out, 1)
+            self.add_loss(self.rate_regularizer(rates))
+            if training:  # the metric variables are not captured by inference graphs, e.g. exported signatures
+                self.rate_metric.update_state(tf.reduce_mean(rates))
+        if self.return_sequences:
+            return out
+        return out[:, -1]
@@ -0,0 +1,155 @@
+"""Contains sparse SNU cell definition used for inference with pruned weights.
+"""
+
+import numpy as np
+from neuroaikit.tf.activations import *
+from neuroaikit.tf import activations
+from neuroaikit.tf.profiling import annotate
+
+
+def _to_sparse_parts(dense):
+    """Converts a dense [inputs, units] matrix into the row-sorted sparse form of its transposition.
+
+    :param dense: NumPy array with the dense weights
+    :return: (rows, columns, values) of the non-zero elements of the [units, inputs] matrix, sorted by rows
+    """
+    transposed = np.asarray(dense).T
+    rows, columns = np.nonzero(transposed)
+    return rows.astype(np.int32), columns.astype(np.int32), transposed[rows, columns]
+
+
+def _empty_sparse_parts(nonzeros):
+    """Creates placeholder sparse parts with `nonzeros` elements that are overwritten when the weights are loaded."""
+    return np.zeros(nonzeros, np.int32), np.zeros(nonzeros, np.int32), np.zeros(nonzeros, np.float32)
+
+
+@tf.keras.utils.register_keras_serializable(package='neuroaikit')
+class SNUSparseCell(tf.keras.layers.Layer):
+    """This is an SNU cell that stores its weights in a sparse form.
+
+    The weights are given at construction time, typically after magnitude pruning (see :mod:`neuroaikit.tf.pruning`).
+    Only the non-zero weights are stored, sorted by the output unit, together with their int32 coordinates.
+    The sparse-dense product gathers the inputs of every non-zero weight and sums them per output unit,
+    which on CPU is faster than `tf.sparse.sparse_dense_matmul`. The cell is meant for inference,
+    so the sparse weights are not trainable. The configuration stores only the shapes and the numbers of
+    the non-zero weights, while the sparse weights themselves are saved and loaded as the weights of the cell.
+
+    :param units: Number of units to create in the layer
+    :param kernel: Dense input weights of shape [inputs, units]
+    :param recurrent_kernel: Dense recurrent weights of shape [units, units], defaults to None (no recurrence)
+    :param bias: Threshold values of shape [units], defaults to None (ones)
+    :param decay: Membrane potential decay multiplier, defaults to 0.8,
+        i.e. 0.8 of the previous membrane potential is retained
+    :param activation: Activation function, defaults to step_function. See TF_Misc.Activations.
+    :param g: Internal state activation function that optionally constraints the state,
+        defaults to tf.identity (no constraint)
+    :param lateral_inhibition: bool, defaults to False. If True, layer-wise lateral inhibition is used.
+    """
+
+    def __init__(self, units, kernel, recurrent_kernel=None, bias=None, decay=0.8, activation=step_function,
+                 g=tf.identity, lateral_inhibition=False, **kwargs):
+        """Constructor method"""
+        super(SNUSparseCell, self).__init__(**kwargs)
+        self.units = units
+        self.state_size = (units, units)
+        self.decay = decay
+        self.activation = activations.get(activation)
+        self.g = activations.get(g)
+        self.lateral_inhibition = lateral_inhibition
+        self.recurrent = recurrent_kernel is not None
+        self.kernel_shape = tuple(np.shape(kernel))
+        self._kernel_parts = _to_sparse_parts(kernel)
+        self._recurrent_kernel_parts = _to_sparse_parts(recurrent_kernel) if self.recurrent else None
+        self._bias_value = np.ones(units, dtype=np.float32) if bias is None else np.asarray(bias)
+
+    def get_config(self):
+        """Returns the configuration of the cell for serialization"""
+        config = super(SNUSparseCell, self).get_config()
+        config.update({'units': self.units, 'kernel_shape': list(self.kernel_shape),
+                       'kernel_nonzeros': len(self._kernel_parts[0]),
+                       'recurrent_nonzeros': len(self._recurrent_kernel_parts[0]) if self.recurrent else None,
+                       'decay': self.decay, 'activation': activations.serialize(self.activation),
+                       'g': activations.serialize(self.g), 'lateral_inhibition': self.lateral_inhibition})
+        return config
+
+    @classmethod
+    def from_config(cls, config):
+        """Creates the cell with placeholder sparse weights of the configured sizes, which are then loaded"""
+        config = dict(config)
+        units, kernel_shape = config.pop('units'), config.pop('kernel_shape')
+        kernel_nonzeros, recurrent_nonzeros = config.pop('kernel_nonzeros'), config.pop('recurrent_nonzeros')
+        recurrent_kernel = None if recurrent_nonzeros is None else np.zeros((units, units), np.float32)
+        cell = cls(units, np.zeros(kernel_shape, np.float32), recurrent_kernel=recurrent_kernel, **config)
+        cell._kernel_parts = _empty_sparse_parts(kernel_nonzeros)
+        if recurrent_kernel is not None:
+            cell._recurrent_kernel_parts = _empty_sparse_parts(recurrent_nonzeros)
+        return cell
+
+    @classmethod
+    def from_dense(cls, cell):
+        """Creates a sparse cell from a trained (and pruned) SNUBasicCell or SNULICell.
+
+        :param cell: dense SNU cell
+        :return: SNUSparseCell with the non-zero weights of the given cell
+        """
+        from .snulicell import SNULICell
+        if cell.input_rank is not None or (cell.recurrent and cell.recurrent_rank is not None):
+            raise ValueError('Cells with low-rank factorized weights cannot be converted to SNUSparseCell')
+        recurrent_kernel = cell.recurrent_kernel.numpy() if cell.recurrent else None
+        return cls(cell.units, cell.kernel.numpy(), recurrent_kernel=recurrent_kernel, bias=cell.bias.numpy(),
+                   decay=cell.decay, activation=cell.activation, g=cell.g,
+                   lateral_inhibition=isinstance(cell, SNULICell))
+
+    def _add_sparse_weight(self, parts, name):
+        rows, columns, values = parts
+        rows = self.add_weight(shape=rows.shape, dtype=tf.int32, trainable=False, name=name + '_rows',
+                               initializer=tf.constant_initializer(rows))
+        columns = self.add_weight(shape=columns.shape, dtype=tf.int32, trainable=False, name=name + '_columns',
+                                  initializer=tf.constant_initializer(columns))
+        values = self.add_weight(shape=values.shape, trainable=False, name=name + '_values',
+                                 initializer=tf.constant_initializer(values))
+        return rows, columns, values
+
+    def build(self, input_shape):
+        """Overriding build method that creates the variables
+
+        :param input_shape: Shape of the input
+        """
+        self.kernel = self._add_sparse_weight(self._kernel_parts, 'kernel')
+        if self.recurrent:
+            self.recurrent_kernel = self._add_sparse_weight(self._recurrent_kernel_parts, 'recurrent_kernel')
+        self.bias = self.add_weight(shape=(self.units,), name='bias', trainable=False,
+                                    initializer=tf.constant_initializer(self._bias_value))
+        self.built = True
+
+    def _sparse_matmul(self, inputs, kernel):
+        # (inputs @ W)[:, j] is the sum of inputs[:, i] * W[i, j] over the non-zero weights in column j of W
+        rows, columns, values = kernel
+        products = tf.gather(tf.transpose(inputs), columns) * tf.expand_dims(values, 1)
+        return tf.transpose(tf.math.unsorted_segment_sum(products, rows, self.units))
+
+    def call(self, inputs, states):
+        """Overriding call method that defines the cell dynamics' graph
+
+        :param inputs: Tensor representing the input in particular timestep
+        :param states: Tuple with previous state values
+        :return: Output values, State values.
+        """
+        (out_prev, Vm_prev) = states
+        with annotate('reset'):
+            if self.lateral_inhibition:
+                Vm = Vm_prev * (1.0 - tf.reduce_max(out_prev, axis=-1, keepdims=True))
+            else:
+                Vm = Vm_prev * (1.0 - out_prev)
+            Vm = Vm * self.decay
+        with annotate('input_matmul'):
+            Vm = Vm + self._sparse_matmul(inputs, self.kernel)
+        if self.recurrent:
+            with annotate('recurrent_matmul'):
+                Vm = Vm + self._sparse_matmul(out_prev, self.recurrent_kernel)
+        with annotate('g'):
+            Vm = self.g(Vm)
+        with annotate('activation'):
+            overVth = Vm - self.bias
+            out = self.activation(overVth)
+        return out, (out, Vm)
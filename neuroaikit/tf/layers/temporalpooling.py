@@ -0,0 +1,88 @@
+"""Contains temporal pooling layer for spike sequences.
+"""
+
+from neuroaikit.tf.activations import *
+
+POOLING_MODES = ('sum', 'or')
+
+
+def temporal_pool(inputs, pool_size, mode='sum'):
+    """Pools a sequence over non-overlapping windows of `pool_size` timesteps.
+    The last incomplete window is padded with zeros.
+
+    :param inputs: Tensor [batch, time, features]
+    :param pool_size: number of timesteps in a window
+    :param mode: 'sum' (number of spikes in the window) or 'or' (at least one spike in the window),
+        defaults to 'sum'
+    :return: Tensor [batch, ceil(time / pool_size), features]
+    """
+    if mode not in POOLING_MODES:
+        raise ValueError('Unknown pooling mode: {}'.format(mode))
+    padding = -tf.shape(inputs)[1] % pool_size
+    x = tf.pad(inputs, [[0, 0], [0, padding], [0, 0]])
+    x = tf.reshape(x, [tf.shape(x)[0], -1, pool_size, inputs.shape[-1]])
+    if mode == 'sum':
+        return tf.reduce_sum(x, 2)
+    return tf.reduce_max(x, 2)
+
+
+def temporal_pool_mask(mask, pool_size):
+    """Pools a [batch, time] mask, a window is valid if any of its timesteps is valid.
+
+    :param mask: bool Tensor [batch, time] or None
+    :param pool_size: number of timesteps in a window
+    :return: bool Tensor [batch, ceil(time / pool_size)] or None
+    """
+    if mask is None:
+        return None
+    if hasattr(tf.keras, 'KerasTensor') and tf.keras.backend.is_keras_tensor(mask):
+        # Keras 3 symbolic mask of a model under construction, which is not accepted by TensorFlow ops
+        timesteps = mask.shape[1] if mask.shape[1] is None else -(-mask.shape[1] // pool_size)
+        return tf.keras.KerasTensor((mask.shape[0], timesteps), dtype=mask.dtype)
+    mask = tf.pad(mask, [[0, 0], [0, -tf.shape(mask)[1] % pool_size]])
+    return tf.reduce_any(tf.reshape(mask, [tf.shape(mask)[0], -1, pool_size]), 2)
+
+
+@tf.keras.utils.register_keras_serializable(package='neuroaikit')
+class TemporalPooling(tf.keras.layers.Layer):
+    """This is a temporal pooling (striding) layer for spike sequences.
+
+    The following layers operate on `time / pool_size` timesteps, which reduces their computation accordingly.
+
+    :param pool_size: number of timesteps pooled into one
+    :param mode: 'sum' (number of spikes in the window) or 'or' (at least one spike in the window),
+        defaults to 'sum'
+    """
+
+    def __init__(self, pool_size, mode='sum', **kwargs):
+        """Constructor method"""
+        super(TemporalPooling, self).__init__(**kwargs)
+        if mode not in POOLING_MODES:
+            raise ValueError('Unknown pooling mode: {}'.format(mode))
+        self.pool_size = pool_size
+        self.mode = mode
+        self.supports_masking = True
+
+    def get_config(self):
+        """Returns the configuration of the layer for serialization"""
+        config = super(TemporalPooling, self).get_config()
+        config.update({'pool_size': self.pool_size, 'mode': self.mode})
+        return config
+
+    def call(self, inputs):
+        """Overriding call method that pools the sequence
+
+        :param inputs: Tensor [batch, time, features]
+        :return: Tensor [batch, ceil(time / pool_size), features]
+        """
+        return temporal_pool(inputs, self.pool_size, self.mode)
+
+    def compute_mask(self, inputs, mask=None):
+        return temporal_pool_mask(mask, self.pool_size)
+
+    def compute_output_shape(self, input_shape):
+        input_shape = tf.TensorShape(input_shape)
+        timesteps = input_shape[1]
+        if timesteps is not None:
+            timesteps = -(-timesteps // self.pool_size)
+        return tf.TensorShape([input_shape[0], timesteps, input_shape[2]])
@@ -0,0 +1,192 @@
+"""Online training of SNU networks with eligibility traces (e-prop).
+
+Backpropagation through time stores all timesteps of a sequence. E-prop, see G. Bellec et al., "A solution to the
+learning dilemma for recurrent networks of spiking neurons", Nat Commun 11, 3625 (2020), instead keeps
+per-synapse eligibility traces that are updated forward in time together with the SNU state, and combines them
+with a learning signal available at every timestep. The memory therefore does not depend on the sequence length.
+
+For the SNU dynamics Vm_t = g(decay * (1 - out_{t-1}) * Vm_{t-1} + W x_t) and out_t = activation(Vm_t - bias),
+with the reset treated as a constant (as in e-prop), the eligibility vector of a synapse W_ij is:
+
+    eps_t = g'_t * (decay * (1 - out_{t-1}) * eps_{t-1} + x_t)
+
+and its eligibility trace is e_t = psi_t * eps_t, where psi_t is the (surrogate) derivative of the activation,
+e.g. of `step_function`. The weight gradient is the sum over time of L_t * e_t, where the learning signal L_t is
+the derivative of the loss at timestep t with respect to the output spikes.
+"""
+
+import numpy as np
+import tensorflow as tf
+from .layers import SNUBasicCell, SNULICell
+
+
+class EProp:
+    """Trains a model consisting of an SNU layer followed by readout layers online with e-prop.
+
+    The first layer of the model must be an SNU layer with full-rank weights created with
+    :func:`~neuroaikit.tf.layers.SNU` and `return_sequences=True`. The remaining layers form the readout that is
+    applied to the SNU output in every timestep. The readout weights receive their exact per-step gradients,
+    while the SNU weights are trained with the eligibility traces.
+
+    :param model: built Keras Sequential model
+    :param loss: Keras loss function computed per timestep
+    :param optimizer: Keras optimizer
+    :param update_every: number of timesteps over which the gradients are accumulated before updating
+        the weights, defaults to 1. The remaining gradients are applied at the end of every sequence.
+    :raises ValueError: if the model is not supported or the e-prop forward pass does not reproduce the SNU cell
+    """
+
+    def __init__(self, model, loss, optimizer, update_every=1):
+        """Constructor method"""
+        rnn = model.layers[0]
+        if not isinstance(rnn, tf.keras.layers.RNN) or not isinstance(rnn.cell, (SNUBasicCell, SNULICell)):
+            raise ValueError('The first layer of the model must be an SNU layer')
+        if getattr(rnn, 'clock_divider', 1) != 1:
+            raise ValueError('E-prop does not support SNU layers with a divided clock')
+        self.cell = rnn.cell
+        if self.cell.input_rank is not None or (self.cell.recurrent and self.cell.recurrent_rank is not None):
+            raise ValueError('E-prop supports only SNU layers with full-rank weights')
+        self.readout = model.layers[1:]
+        self.loss = loss
+        self.optimizer = optimizer
+        self.update_every = update_every
+        self.snu_variables = [self.cell.kernel, self.cell.bias]
+        if self.cell.recurrent:
+            self.snu_variables.insert(1, self.cell.recurrent_kernel)
+        self.readout_variables = [v for layer in self.readout for v in layer.trainable_variables]
+        self.gradients = [tf.Variable(tf.zeros_like(v), trainable=False)
+                          for v in self.snu_variables + self.readout_variables]
+        self.states = None
+        self.step_count = 0
+        self.accumulated_steps = 0
+        self._check_forward()
+        self._step = tf.function(self._train_step)
+
+    def _forward(self, inputs, out_prev, Vm_prev):
+        # the cell dynamics with the pre-activation of g exposed, which is needed for the eligibility vectors
+        cell = self.cell
+        if isinstance(cell, SNULICell):
+            reset = 1.0 - tf.reduce_max(out_prev, axis=-1, keepdims=True)
+        else:
+            reset = 1.0 - out_prev
+        pre = Vm_prev * reset * cell.decay + tf.matmul(inputs, cell.kernel)
+        if cell.recurrent:
+            pre = pre + tf.matmul(out_prev, cell.recurrent_kernel)
+        return reset, pre
+
+    def _check_forward(self, batch_size=4):
+        # the e-prop forward pass must produce the same spikes and membrane potentials as `cell.call`
+        cell = self.cell
+        inputs = tf.cast(tf.random.uniform((batch_size, cell.kernel.shape[0])) < 0.5, tf.float32)
+        out_prev = tf.cast(tf.random.uniform((batch_size, cell.units)) < 0.5, tf.float32)
+        Vm_prev = tf.random.uniform((batch_size, cell.units))
+        states = [out_prev, Vm_prev] + [tf.zeros_like(Vm_prev)] * (len(cell.state_size) - 2)
+        cell_out, cell_states = cell.call(inputs, states)
+        _, pre = self._forward(inputs, out_prev, Vm_prev)
+        Vm = cell.g(pre)
+        out = cell.activation(Vm - cell.bias)
+        if not (np.allclose(Vm, cell_states[1], atol=1e-5) and np.allclose(out, cell_out, atol=1e-5)):
+            raise ValueError('The e-prop forward pass does not match {}.call'.format(type(cell).__name__))
+
+    def reset_states(self, batch_size):
+        """Resets the SNU state and eligibility vectors before a new sequence.
+
+        :param batch_size: number of sequences processed in parallel
+        """
+        units = self.cell.units
+        zeros = tf.zeros((batch_size, units))
+        eps_kernel = tf.zeros((batch_size, self.cell.kernel.shape[0], units))
+        eps_recurrent = tf.zeros((batch_size, units, units)) if self.cell.recurrent else tf.zeros((batch_size, 0, 0))
+        self.states = (zeros, zeros, eps_kernel, eps_recurrent)
+
+    def _readout(self, out):
+        for layer in self.readout:
+            out = layer(out)
+        return out
+
+    def _train_step(self, inputs, targets, states):
+        out_prev, Vm_prev, eps_kernel, eps_recurrent = states
+        cell = self.cell
+        inputs = tf.cast(inputs, out_prev.dtype)
+        with tf.GradientTape(persistent=True) as tape:
+            reset, pre = self._forward(inputs, out_prev, Vm_prev)
+            tape.watch(pre)
+            Vm = cell.g(pre)
+            out = cell.activation(Vm - cell.bias)
+            loss = tf.reduce_mean(self.loss(targets, self._readout(out)))
+        learning_signal = tape.gradient(loss, out)
+        readout_gradients = tape.gradient(loss, self.readout_variables)
+        dg = tape.gradient(Vm, pre)  # g' (elementwise)
+        psi = tape.gradient(out, Vm)  # surrogate derivative of the activation (elementwise)
+        del tape
+
+        # eligibility vectors: eps_t = g'_t * (decay * reset_t * eps_{t-1} + presynaptic_t)
+        alpha = tf.expand_dims(dg * reset * cell.decay, 1)
+        eps_kernel = alpha * eps_kernel + tf.expand_dims(inputs, 2) * tf.expand_dims(dg, 1)
+        signal = tf.expand_dims(learning_signal * psi, 1)  # L_t * psi_t
+        snu_gradients = [tf.reduce_sum(signal * eps_kernel, 0), -tf.reduce_sum(learning_signal * psi, 0)]
+        if cell.recurrent:
+            eps_recurrent = alpha * eps_recurrent + tf.expand_dims(out_prev, 2) * tf.expand_dims(dg, 1)
+            snu_gradients.insert(1, tf.reduce_sum(signal * eps_recurrent, 0))
+
+        for accumulator, gradient in zip(self.gradients, snu_gradients + readout_gradients):
+            accumulator.assign_add(gradient)
+        return loss, (tf.stop_gradient(out), tf.stop_gradient(Vm), eps_kernel, eps_recurrent)
+
+    def train_step(self, inputs, targets):
+        """Processes one timestep and updates the weights every `update_every` steps.
+
+        :param inputs: Tensor [batch, inputs] with the input in the current timestep
+        :param targets: Tensor [batch, outputs] with the target in the current timestep
+        :return: loss in the current timestep
+        """
+        if self.states is None:
+            self.reset_states(inputs.shape[0])
+        loss, self.states = self._step(inputs, targets, self.states)
+        self.step_count += 1
+        self.accumulated_steps += 1
+        if self.accumulated_steps == self.update_every:
+            self.apply_gradients()
+        return loss
+
+    def apply_gradients(self):
+        """Applies the gradients averaged over the accumulated timesteps and clears them."""
+        if self.accumulated_steps == 0:
+            return
+        self.optimizer.apply_gradients(
+            [(accumulator / self.accumulated_steps, v) for accumulator, v
+             in zip(self.gradients, self.snu_variables + self.readout_variables)])
+        for accumulator in self.gradients:
+            accumulator.assign(tf.zeros_like(accumulator))
+        self.accumulated_steps = 0
+
+    def fit_sequence(self, inputs, targets):
+        """Trains on a batch of sequences processing them one timestep at a time. The gradients that remain
+        accumulated at the end of the sequences are applied, so that they do not carry over to the next sequences.
+
+        :param inputs: array [batch, time, inputs]
+        :param targets: array [batch, time, outputs]
+        :return: loss averaged over the timesteps
+        """
+        self.reset_states(inputs.shape[0])
+        total = 0.0
+        for t in range(inputs.shape[1]):
+            total += float(self.train_step(inputs[:, t], targets[:, t]))
+        self.apply_gradients()
+        return total / inputs.shape[1]
+
+    def fit(self, dataset, epochs=1, verbose=1):
+        """Trains on a dataset of (inputs, targets) batches of sequences.
+
+        :param dataset: iterable yielding (inputs, targets) arrays [batch, time, features]
+        :param epochs: number of epochs
+        :param verbose: if True, the average loss is printed after every epoch
+        :return: list with average losses of the epochs
+        """
+        history = []
+        for epoch in range(epochs):
+            losses = [self.fit_sequence(inputs, targets) for inputs, targets in dataset]
+            history.append(sum(losses) / len(losses))
+            if verbose:
+                print('Epoch {}/{} - loss: {:.4f}'.format(epoch + 1, epochs, history[-1]))
+        return history
@@ -0,0 +1,228 @@
+"""Opt-in profiling of SNU models.
+
+The SNU cells and layers mark the phases of their `call`, e.g. `reset`, `input_matmul`, `recurrent_matmul`, `g`
+and `activation`, with :func:`annotate`. When profiling is enabled, every phase gets a `tf.name_scope`, so that
+its ops are grouped under the phase name in the TensorBoard trace viewer, and a `tf.profiler` trace annotation
+for eager execution. When profiling is disabled, :func:`annotate` returns a no-op context and the graphs are
+unchanged, i.e. there is no cost. The annotations are added when a model is traced, so profiling must be enabled
+before the first call of the model, e.g. before `fit`.
+
+:class:`ProfilerCallback` enables the annotations during `fit`, optionally records a trace of selected batches
+viewable offline in TensorBoard (Profile tab), and at the end of training reports per-layer forward and backward
+time, time per timestep and activation memory, measured with :func:`profile_layers`.
+
+Usage::
+
+    import neuroaikit.tf as aitf
+    profiler = aitf.profiling.ProfilerCallback(x_sample, logdir='logs/profile', output='profile.json')
+    model.fit(ds, epochs=1, callbacks=[profiler])
+"""
+
+import contextlib
+import json
+import time
+import numpy as np
+import tensorflow as tf
+
+_enabled = False
+_NO_ANNOTATION = contextlib.nullcontext()
+
+
+def enable():
+    """Enables the annotations of models traced from now on."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Disables the annotations of models traced from now on."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    """Returns True if profiling is enabled."""
+    return _enabled
+
+
+class _Annotation:
+
+    def __init__(self, name):
+        self.scope = tf.name_scope(name)
+        self.trace = tf.profiler.experimental.Trace(name)
+
+    def __enter__(self):
+        self.scope.__enter__()
+        self.trace.__enter__()
+
+    def __exit__(self, *exc_info):
+        self.trace.__exit__(*exc_info)
+        return self.scope.__exit__(*exc_info)
+
+
+def annotate(name):
+    """Marks a phase of the computation for the profiler.
+
+    :param name: name of the phase
+    :return: context manager, a no-op if profiling is disabled
+    """
+    if not _enabled:
+        return _NO_ANNOTATION
+    return _Annotation(name)
+
+
+def _timeit(function, repeats):
+    function()  # tracing and warm-up
+    times = []
+    for _ in range(repeats):
+        time_start = time.perf_counter()
+        tf.nest.map_structure(lambda t: t.numpy(), function())
+        times.append(time.perf_counter() - time_start)
+    return float(np.median(times))
+
+
+def _activation_bytes(layer, outputs, timesteps):
+    # the RNN loop keeps the output and states of every timestep for the backward pass
+    size = int(np.prod(outputs.shape)) * outputs.dtype.size
+    if isinstance(layer, tf.keras.layers.RNN):
+        timesteps = -(-timesteps // getattr(layer, 'clock_divider', 1))
+        batch_size = outputs.shape[0]
+        state_size = tf.nest.flatten(layer.cell.state_size)
+        size += batch_size * timesteps * sum(state_size) * outputs.dtype.size
+        if not layer.return_sequences:
+            size += batch_size * (timesteps - 1) * layer.cell.units * outputs.dtype.size
+    return size
+
+
+def profile_layers(model, inputs, repeats=10):
+    """Measures every layer of a Sequential model separately on the given inputs.
+
+    The inputs of every layer are obtained by evaluating the preceding layers. The forward time is the time of
+    the compiled layer call, the backward time is the time of the compiled call with the gradients with respect
+    to the layer inputs and weights minus the forward time. The activation memory is estimated as the size of
+    the outputs and states of all timesteps that the layer keeps for the backward pass.
+
+    :param model: built Keras Sequential model
+    :param inputs: Tensor [batch, time, features] with sample inputs
+    :param repeats: number of timed repetitions, the median time is reported, defaults to 10
+    :return: list with a dict of results per layer
+    """
+    x = tf.convert_to_tensor(inputs, tf.float32)
+    timesteps = x.shape[1]
+    report = []
+    for layer in model.layers:
+        layer_inputs = x
+
+        @tf.function
+        def forward():
+            return layer(layer_inputs, training=True)
+
+        @tf.function
+        def backward():
+            with tf.GradientTape() as tape:
+                tape.watch(layer_inputs)
+                y = layer(layer_inputs, training=True)
+            return tape.gradient(y, [layer_inputs] + layer.trainable_variables,
+                                 unconnected_gradients=tf.UnconnectedGradients.ZERO)
+
+        x = forward()
+        forward_time = _timeit(forward, repeats)
+        backward_time = max(0.0, _timeit(backward, repeats) - forward_time)
+        is_sequence = x.shape.rank == 3 or isinstance(layer, tf.keras.layers.RNN)
+        report.append({
+            'layer': layer.name,
+            'type': type(layer.cell).__name__ if isinstance(layer, tf.keras.layers.RNN) else type(layer).__name__,
+            'forward_ms': forward_time * 1e3,
+            'backward_ms': backward_time * 1e3,
+            'timestep_us': (forward_time + backward_time) / timesteps * 1e6 if is_sequence else None,
+            'activation_bytes': _activation_bytes(layer, x, timesteps),
+        })
+    return report
+
+
+def format_table(report):
+    """Formats the results of :func:`profile_layers` as a text table.
+
+    :param report: list with a dict of results per layer
+    :return: str with the table
+    """
+    lines = ['{:<20} {:<16} {:>13} {:>13} {:>14} {:>17}'.format(
+        'Layer', 'Type', 'Forward [ms]', 'Backward [ms]', 'Timestep [us]', 'Activations [MiB]')]
+    for row in report:
+        timestep = '-' if row['timestep_us'] is None else '{:.1f}'.format(row['timestep_us'])
+        lines.append('{:<20} {:<16} {:>13.2f} {:>13.2f} {:>14} {:>17.2f}'.format(
+            row['layer'], row['type'], row['forward_ms'], row['backward_ms'], timestep,
+            row['activation_bytes'] / 2 ** 20))
+    return '\n'.join(lines)
+
+
+class ProfilerCallback(tf.keras.callbacks.Callback):
+    """Keras callback that profiles a model during `fit`.
+
+    The annotations of the SNU cells are enabled for the duration of the training. The trace of the batches
+    in `trace_batches` is written to `logdir`, and at the end of the training the layers are measured with
+    :func:`profile_layers` on the sample inputs. The results are stored in `report`, printed as a table
+    and optionally written as JSON. The median time of the training steps is added to the logs as `step_time`.
+
+    :param inputs: Tensor [batch, time, features] with sample inputs for the per-layer measurements
+    :param logdir: directory of the trace, defaults to None (no trace)
+    :param trace_batches: (first, last) training step numbers of the trace, defaults to (2, 4)
+        to skip the tracing of the model
+    :param output: path of the JSON file with the results, defaults to None
+    :param repeats: number of timed repetitions of the per-layer measurements, defaults to 10
+    :param verbose: if True, the table with the results is printed, defaults to 1
+    """
+
+    def __init__(self, inputs, logdir=None, trace_batches=(2, 4), output=None, repeats=10, verbose=1):
+        """Constructor method"""
+        super(ProfilerCallback, self).__init__()
+        self.inputs = inputs
+        self.logdir = logdir
+        self.trace_batches = trace_batches
+        self.output = output
+        self.repeats = repeats
+        self.verbose = verbose
+        self.report = None
+        self.step = 0
+        self.step_times = []
+        self._tracing = False
+
+    def on_train_begin(self, logs=None):
+        self._was_enabled = is_enabled()
+        enable()
+        # retraced with the annotations, Keras 2 and Keras 3 both store the new function in `model.train_function`
+        self.model.make_train_function(force=True)
+
+    def on_train_batch_begin(self, batch, logs=None):
+        if self.logdir is not None and self.step == self.trace_batches[0]:
+            tf.profiler.experimental.start(self.logdir)
+            self._tracing = True
+        self._time_start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        self.step_times.append(time.perf_counter() - self._time_start)
+        if self._tracing and self.step == self.trace_batches[1]:
+            self._stop_trace()
+        self.step += 1
+
+    def on_epoch_end(self, epoch, logs=None):
+        if logs is not None and self.step_times:
+            logs['step_time'] = float(np.median(self.step_times))
+
+    def on_train_end(self, logs=None):
+        if self._tracing:
+            self._stop_trace()
+        if not self._was_enabled:
+            disable()
+            self.model.train_function = None  # retraced without the annotations by the next fit
+        self.report = profile_layers(self.model, self.inputs, self.repeats)
+        if self.verbose:
+            print(format_table(self.report))
+        if self.output is not None:
+            with open(self.output, 'w') as f:
+                json.dump({'step_time': float(np.median(self.step_times)) if self.step_times else None,
+                           'layers': self.report}, f, indent=2)
+
+    def _stop_trace(self):
+        tf.profiler.experimental.stop()
+        self._tracing = False
@@ -0,0 +1,171 @@
+"""Magnitude pruning of SNU layers.
+
+Typical workflow:
+
+1. Train the model with :class:`PruningCallback` that gradually zeroes the smallest weights of SNU layers.
+2. Convert the pruned model with :func:`sparsify`, which replaces the SNU layers with ones using
+   :class:`~neuroaikit.tf.layers.SNUSparseCell` that store only the non-zero weights.
+"""
+
+import numpy as np
+import tensorflow as tf
+from .layers import SNUBasicCell, SNULICell, SNUSparseCell, ClockDividedRNN
+
+
+def polynomial_sparsity(step, final_sparsity, begin_step, end_step, initial_sparsity=0.0, power=3):
+    """Gradual pruning schedule from M. Zhu and S. Gupta, "To prune, or not to prune: exploring the efficacy
+    of pruning for model compression", 2017.
+
+    :param step: current training step
+    :param final_sparsity: sparsity reached at `end_step`
+    :param begin_step: step at which pruning starts
+    :param end_step: step at which the final sparsity is reached
+    :param initial_sparsity: sparsity at `begin_step`, defaults to 0.0
+    :param power: exponent of the polynomial, defaults to 3 (fast pruning at the beginning, slow at the end)
+    :return: target sparsity for the given step
+    """
+    if step < begin_step:
+        return 0.0
+    progress = min(1.0, (step - begin_step) / max(1, end_step - begin_step))
+    return final_sparsity + (initial_sparsity - final_sparsity) * (1.0 - progress) ** power
+
+
+def magnitude_mask(weights, sparsity):
+    """Computes a binary mask that zeroes the `sparsity` fraction of the weights with the smallest magnitude.
+
+    :param weights: NumPy array with weights
+    :param sparsity: fraction of the weights to remove, in range [0, 1]
+    :return: mask with the same shape as the weights
+    """
+    k = int(round(sparsity * weights.size))
+    if k == 0:
+        return np.ones_like(weights)
+    magnitudes = np.abs(weights).ravel()
+    threshold = np.partition(magnitudes, k - 1)[k - 1]
+    return (np.abs(weights) > threshold).astype(weights.dtype)
+
+
+def snu_layers(model):
+    """Lists the SNU layers with dense weights in a model.
+
+    :param model: Keras model
+    :return: list of RNN layers with SNUBasicCell or SNULICell cells
+    """
+    return [layer for layer in model.layers
+            if isinstance(layer, tf.keras.layers.RNN) and isinstance(layer.cell, (SNUBasicCell, SNULICell))]
+
+
+def prunable_weights(model, names=('kernel', 'recurrent_kernel')):
+    """Lists the prunable weights of the SNU layers in a model.
+
+    :param model: Keras model
+    :param names: names of the cell weights to consider, defaults to ('kernel', 'recurrent_kernel')
+    :return: list of variables
+    """
+    variables = []
+    for layer in snu_layers(model):
+        for name in names:
+            variable = getattr(layer.cell, name, None)
+            if hasattr(variable, 'assign'):  # tf.Variable or Keras 3 keras.Variable
+                variables.append(variable)
+    return variables
+
+
+def get_sparsity(model, weights=('kernel', 'recurrent_kernel')):
+    """Reports the fraction of zero weights in the SNU layers.
+
+    :param model: Keras model
+    :param weights: names of the cell weights to consider
+    :return: dict mapping the weight names to their sparsity
+    """
+    return {getattr(variable, 'path', variable.name): float(np.mean(np.asarray(variable.numpy()) == 0))
+            for variable in prunable_weights(model, weights)}
+
+
+class PruningCallback(tf.keras.callbacks.Callback):
+    """Keras callback performing gradual magnitude pruning of SNU layers during `fit`.
+
+    Every `frequency` training steps the target sparsity is obtained from :func:`polynomial_sparsity` and the masks
+    are recomputed from the current weight magnitudes. After every training step the masks are applied, so that
+    the pruned weights stay zero.
+
+    :param final_sparsity: sparsity reached at `end_step`, defaults to 0.9
+    :param begin_step: step at which pruning starts, defaults to 0
+    :param end_step: step at which the final sparsity is reached, defaults to 1000
+    :param frequency: number of steps between mask updates, defaults to 100
+    :param initial_sparsity: sparsity at `begin_step`, defaults to 0.0
+    :param power: exponent of the pruning schedule, defaults to 3
+    :param weights: names of the cell weights to prune, defaults to ('kernel', 'recurrent_kernel')
+    :raises ValueError: at the beginning of training if the model has no such weights in its SNU layers
+    """
+
+    def __init__(self, final_sparsity=0.9, begin_step=0, end_step=1000, frequency=100, initial_sparsity=0.0,
+                 power=3, weights=('kernel', 'recurrent_kernel')):
+        """Constructor method"""
+        super(PruningCallback, self).__init__()
+        self.final_sparsity = final_sparsity
+        self.begin_step = begin_step
+        self.end_step = end_step
+        self.frequency = frequency
+        self.initial_sparsity = initial_sparsity
+        self.power = power
+        self.weights = weights
+        self.step = 0
+        self.sparsity = 0.0
+        self.masks = {}
+
+    def on_train_begin(self, logs=None):
+        self.variables = prunable_weights(self.model, self.weights)
+        if not self.variables:
+            raise ValueError('PruningCallback did not find any SNU weights {} to prune'.format(self.weights))
+
+    def on_train_batch_begin(self, batch, logs=None):
+        if self.begin_step <= self.step <= self.end_step and (self.step - self.begin_step) % self.frequency == 0:
+            self.sparsity = polynomial_sparsity(self.step, self.final_sparsity, self.begin_step, self.end_step,
+                                                self.initial_sparsity, self.power)
+            for variable in self.variables:
+                self.masks[id(variable)] = tf.constant(magnitude_mask(np.asarray(variable.numpy()), self.sparsity))
+            self._apply_masks()
+
+    def on_train_batch_end(self, batch, logs=None):
+        self._apply_masks()
+        self.step += 1
+
+    def on_epoch_end(self, epoch, logs=None):
+        if logs is not None:
+            logs['sparsity'] = self.sparsity
+
+    def _apply_masks(self):
+        for variable in self.variables:
+            mask = self.masks.get(id(variable))
+            if mask is not None:
+                variable.assign(variable * mask)
+
+
+def sparsify(model):
+    """Creates a copy of the model in which the SNU layers use sparse weights for inference.
+
+    Weights of the SNU layers are converted into :class:`~neuroaikit.tf.layers.SNUSparseCell`,
+    while the weights of all other layers are copied.
+
+    :param model: trained (and pruned) Keras model
+    :return: new Keras model
+    """
+    pruned = snu_layers(model)
+
+    def clone(layer):
+        if layer in pruned:
+            kwargs = {'return_sequences': layer.return_sequences, 'return_state': layer.return_state,
+                      'go_backwards': layer.go_backwards, 'stateful': layer.stateful, 'unroll': layer.unroll,
+                      'name': layer.name}
+            if isinstance(layer, ClockDividedRNN):
+                return ClockDividedRNN(SNUSparseCell.from_dense(layer.cell), clock_divider=layer.clock_divider,
+                                       pooling=layer.pooling, **kwargs)
+            return tf.keras.layers.RNN(SNUSparseCell.from_dense(layer.cell), **kwargs)
+        return layer.__class__.from_config(layer.get_config())
+
+    sparse_model = tf.keras.models.clone_model(model, clone_function=clone)
+    for layer, sparse_layer in zip(model.layers, sparse_model.layers):
+        if layer not in pruned:
+            sparse_layer.set_weights(layer.get_weights())
+    return sparse_model
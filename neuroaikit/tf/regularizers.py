@@ -0,0 +1,87 @@
+"""Regularizers provided by Neuro-inspired AI Toolkit.
+"""
+
+import tensorflow as tf
+
+
+@tf.keras.utils.register_keras_serializable(package='neuroaikit')
+class FiringRateRegularizer(tf.keras.regularizers.Regularizer):
+    """Activity regularizer of the firing rates of SNU layers, see the `rate_regularizer` argument of
+    :func:`~neuroaikit.tf.layers.SNU`.
+
+    It takes the firing rates [batch, units], i.e. the fraction of timesteps with a spike of every unit and
+    sequence, and penalizes:
+
+    * the squared difference of the mean rate of the layer from `target_rate`,
+    * the mean rate itself with the `sparsity` factor (L1 penalty of the spikes),
+    * the squared violations of per-unit `min_rate` and `max_rate` bounds of the rates averaged over the batch,
+      which avoids dead or saturated units.
+
+    :param target_rate: target mean firing rate of the layer, defaults to None (no target)
+    :param target_strength: factor of the target rate penalty, defaults to 1.0
+    :param sparsity: factor of the mean rate penalty, defaults to 0.0
+    :param min_rate: minimal firing rate of every unit, defaults to None (no bound)
+    :param max_rate: maximal firing rate of every unit, defaults to None (no bound)
+    :param bounds_strength: factor of the rate bounds penalty, defaults to 1.0
+    """
+
+    def __init__(self, target_rate=None, target_strength=1.0, sparsity=0.0, min_rate=None, max_rate=None,
+                 bounds_strength=1.0):
+        """Constructor method"""
+        self.target_rate = target_rate
+        self.target_strength = target_strength
+        self.sparsity = sparsity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.bounds_strength = bounds_strength
+
+    def __call__(self, rates):
+        """Computes the penalty
+
+        :param rates: Tensor [batch, units] with firing rates
+        :return: scalar penalty
+        """
+        mean_rate = tf.reduce_mean(rates)
+        penalty = self.sparsity * mean_rate
+        if self.target_rate is not None:
+            penalty += self.target_strength * tf.square(mean_rate - self.target_rate)
+        unit_rates = tf.reduce_mean(rates, 0)
+        if self.min_rate is not None:
+            penalty += self.bounds_strength * tf.reduce_mean(tf.square(tf.nn.relu(self.min_rate - unit_rates)))
+        if self.max_rate is not None:
+            penalty += self.bounds_strength * tf.reduce_mean(tf.square(tf.nn.relu(unit_rates - self.max_rate)))
+        return penalty
+
+    def get_config(self):
+        """Returns the configuration of the regularizer for serialization"""
+        return {'target_rate': self.target_rate, 'target_strength': self.target_strength, 'sparsity': self.sparsity,
+                'min_rate': self.min_rate, 'max_rate': self.max_rate, 'bounds_strength': self.bounds_strength}
+
+
+def firing_rates(model, inputs):
+    """Measures the firing rates of the units of all SNU layers of a Sequential model.
+
+    :param model: Keras Sequential model
+    :param inputs: Tensor [batch, time, features]
+    :return: dict with a NumPy array [units] of firing rates averaged over the batch and time for every SNU layer
+    """
+    from .layers import SNUBasicCell, SNULICell, SNUSparseCell, SNUScan, ClockDividedRNN
+    from .layers.temporalpooling import temporal_pool
+    rates = {}
+    x = tf.convert_to_tensor(inputs, tf.float32)
+    for layer in model.layers:
+        if isinstance(layer, tf.keras.layers.RNN) and isinstance(layer.cell, (SNUBasicCell, SNULICell, SNUSparseCell)):
+            layer_inputs = x
+            if isinstance(layer, ClockDividedRNN) and layer.clock_divider > 1:
+                layer_inputs = temporal_pool(x, layer.clock_divider, layer.pooling)
+            spikes = tf.keras.layers.RNN(layer.cell, return_sequences=True)(layer_inputs)
+            rates[layer.name] = tf.reduce_mean(spikes, [0, 1]).numpy()
+        elif isinstance(layer, SNUScan):
+            config = dict(layer.get_config(), return_sequences=True, rate_regularizer=None)
+            scan = SNUScan.from_config(config)
+            scan.build(x.shape)
+            scan.set_weights(layer.get_weights())
+            spikes = scan(x)
+            rates[layer.name] = tf.reduce_mean(spikes, [0, 1]).numpy()
+        x = layer(x)
+    return rates
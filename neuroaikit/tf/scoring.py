@@ -0,0 +1,198 @@
+"""Sharded offline batch scoring of SNU models over memory-mapped inputs.
+
+The inputs are a NumPy file [sequences, time, features], e.g. spike trains encoded with
+:func:`neuroaikit.common.utils.transform_rate`, that is memory-mapped and split into shards. The shards are scored
+by a pool of worker processes, each with its own copy of the model and a fixed number of TensorFlow threads
+(optionally pinned to its own CPU cores), and the outputs are written into a preallocated memory-mapped NumPy file.
+The completed shards are recorded in a checkpoint next to the output, so that an interrupted run, e.g. after
+a worker was killed, resumes with the remaining shards. The checkpoint also records the model, the inputs and
+the output shape, so that it is not reused by a different scoring run.
+
+Usage::
+
+    python -m neuroaikit.tf.scoring model.keras inputs.npy outputs.npy --workers 4 --threads 2
+
+or::
+
+    from neuroaikit.tf import scoring
+    stats = scoring.score('model.keras', 'inputs.npy', 'outputs.npy', workers=4, threads=2)
+    print(stats['sequences_per_second'])
+"""
+
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import time
+import numpy as np
+
+_worker = {}
+
+
+def _load_model(path):
+    import tensorflow as tf
+    from .layers import register_all
+    register_all()
+    return tf.keras.models.load_model(path, compile=False)
+
+
+def _fingerprint(path):
+    # size and modification time of a file, or of all files of a directory (SavedModel)
+    path = os.path.abspath(path)
+    files = [path]
+    if os.path.isdir(path):
+        files = [os.path.join(root, name) for root, _, names in os.walk(path) for name in names]
+    stats = [os.stat(f) for f in files]
+    return {'path': path, 'size': sum(stat.st_size for stat in stats),
+            'mtime': max([stat.st_mtime for stat in stats], default=0.0)}
+
+
+def _init_worker(model_path, inputs_path, output_path, batch_size, threads, cores):
+    if cores is not None:
+        os.sched_setaffinity(0, cores.get())
+    import tensorflow as tf
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(threads)
+    except RuntimeError:
+        pass  # TensorFlow was already initialized, e.g. by the main module of a script imported again by 'spawn'
+    model = _load_model(model_path)
+    _worker['predict'] = tf.function(lambda x: model(x, training=False), reduce_retracing=True)
+    _worker['inputs'] = np.load(inputs_path, mmap_mode='r')
+    _worker['outputs'] = np.load(output_path, mmap_mode='r+')
+    _worker['batch_size'] = batch_size
+
+
+def _score_shard(shard):
+    index, start, end = shard
+    inputs, outputs, batch_size = _worker['inputs'], _worker['outputs'], _worker['batch_size']
+    for batch_start in range(start, end, batch_size):
+        batch_end = min(batch_start + batch_size, end)
+        x = np.asarray(inputs[batch_start:batch_end], dtype=np.float32)
+        outputs[batch_start:batch_end] = _worker['predict'](x).numpy()
+    outputs.flush()
+    return index, end - start
+
+
+def _read_checkpoint(path, config):
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint['config'] != config:
+        raise ValueError('The checkpoint {} belongs to a different scoring run'.format(path))
+    return set(checkpoint['done'])
+
+
+def _write_checkpoint(path, config, done):
+    with open(path + '.tmp', 'w') as f:
+        json.dump({'config': config, 'done': sorted(done)}, f)
+    os.replace(path + '.tmp', path)  # atomic, a crash leaves either the old or the new checkpoint
+
+
+def _output_spec(model_path, inputs):
+    # the output shape of a single sequence, evaluated in a separate process to keep TensorFlow out of the parent
+    with concurrent.futures.ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(_probe_output, model_path, np.asarray(inputs[:1], dtype=np.float32)).result()
+
+
+def _probe_output(model_path, x):
+    output = _load_model(model_path)(x, training=False).numpy()
+    return list(output.shape[1:]), output.dtype.str
+
+
+def score(model_path, inputs_path, output_path, workers=1, threads=1, shard_size=10000, batch_size=256,
+          pin_cores=False, verbose=1):
+    """Scores all sequences of the inputs with the model, resuming an interrupted run.
+
+    The workers are started with the 'spawn' method, so in scripts `score` must be called under
+    `if __name__ == '__main__':`.
+
+    :param model_path: path of the saved Keras model, e.g. `model.keras`
+    :param inputs_path: path of the NumPy file with inputs [sequences, time, features]
+    :param output_path: path of the NumPy file with the outputs [sequences, ...], preallocated if it does not exist
+    :param workers: number of worker processes, defaults to 1
+    :param threads: number of TensorFlow threads of every worker, defaults to 1
+    :param shard_size: number of sequences per shard, i.e. the granularity of the checkpoints, defaults to 10000
+    :param batch_size: number of sequences scored at once, defaults to 256
+    :param pin_cores: bool, defaults to False. If True, every worker is pinned to its own `threads` CPU cores.
+    :param verbose: if True, the progress is printed after every shard, defaults to 1
+    :return: dict with the number of sequences scored in this run, the time and the sequences per second
+    :raises ValueError: if the existing checkpoint belongs to a different model, inputs or output
+    :raises RuntimeError: if a worker process died, e.g. killed when out of memory. The completed shards remain
+        in the checkpoint, so that the next run resumes.
+    """
+    inputs = np.load(inputs_path, mmap_mode='r')
+    count = len(inputs)
+    checkpoint_path = output_path + '.checkpoint.json'
+    resume = os.path.exists(output_path)
+    if resume:
+        output = np.load(output_path, mmap_mode='r')
+        shape, dtype = list(output.shape[1:]), output.dtype.str
+        del output
+    else:
+        shape, dtype = _output_spec(model_path, inputs)
+    config = {'model': _fingerprint(model_path), 'inputs': _fingerprint(inputs_path), 'sequences': count,
+              'shard_size': shard_size, 'output_shape': shape, 'output_dtype': dtype}
+    if resume:
+        done = _read_checkpoint(checkpoint_path, config)
+    else:
+        np.lib.format.open_memmap(output_path, mode='w+', dtype=np.dtype(dtype), shape=(count,) + tuple(shape))
+        done = set()
+    shards = [(index, start, min(start + shard_size, count))
+              for index, start in enumerate(range(0, count, shard_size)) if index not in done]
+
+    context = multiprocessing.get_context('spawn')
+    cores = None
+    if pin_cores:
+        available = sorted(os.sched_getaffinity(0))
+        cores = context.Queue()
+        for worker in range(workers):
+            cores.put(set(available[(worker * threads + i) % len(available)] for i in range(threads)))
+    scored = 0
+    time_start = time.time()
+    # unlike multiprocessing.Pool, the executor fails instead of waiting forever when a worker dies
+    with concurrent.futures.ProcessPoolExecutor(
+            workers, mp_context=context, initializer=_init_worker,
+            initargs=(model_path, inputs_path, output_path, batch_size, threads, cores)) as executor:
+        futures = [executor.submit(_score_shard, shard) for shard in shards]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                index, sequences = future.result()
+                done.add(index)
+                _write_checkpoint(checkpoint_path, config, done)
+                scored += sequences
+                if verbose:
+                    elapsed = time.time() - time_start
+                    print('Shard {} done: {}/{} shards, {:.1f} sequences/s'.format(
+                        index, len(done), -(-count // shard_size), scored / elapsed))
+        except concurrent.futures.process.BrokenProcessPool as e:
+            raise RuntimeError('A scoring worker died after {} of {} shards ({}), run again to resume'.format(
+                len(done), -(-count // shard_size), e)) from e
+        finally:
+            for future in futures:
+                future.cancel()
+    duration = time.time() - time_start
+    return {'sequences': scored, 'seconds': duration, 'sequences_per_second': scored / duration if scored else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sharded batch scoring of SNU models over memory-mapped inputs.')
+    parser.add_argument('model', help='path of the saved Keras model')
+    parser.add_argument('inputs', help='NumPy file with inputs [sequences, time, features]')
+    parser.add_argument('output', help='NumPy file with the outputs, preallocated if it does not exist')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--threads', type=int, default=1, help='TensorFlow threads per worker')
+    parser.add_argument('--shard-size', type=int, default=10000)
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--pin-cores', action='store_true', help='pin every worker to its own CPU cores')
+    args = parser.parse_args()
+    stats = score(args.model, args.inputs, args.output, args.workers, args.threads, args.shard_size,
+                  args.batch_size, args.pin_cores)
+    print('Scored {} sequences in {:.1f} s: {:.1f} sequences/s'.format(
+        stats['sequences'], stats['seconds'], stats['sequences_per_second']))
+
+
+if __name__ == '__main__':
+    main()
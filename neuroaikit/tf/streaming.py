@@ -0,0 +1,63 @@
+"""Step-by-step (streaming) execution of sequence models with SNU layers.
+
+A model is evaluated one timestep at a time: the RNN layers (e.g. SNU layers) are evaluated with their cells,
+taking and returning the cell states, e.g. `(out, Vm)`, while the other layers are applied to the values of
+the current timestep. This allows to process unbounded streams and to continue a sequence without recomputing
+its prefix.
+"""
+
+import tensorflow as tf
+from .layers import SNUScan, TemporalPooling, ClockDividedRNN
+
+# layers that operate on entire sequences
+_SEQUENCE_LAYERS = (SNUScan, TemporalPooling, ClockDividedRNN, tf.keras.layers.GlobalAveragePooling1D,
+                    tf.keras.layers.GlobalMaxPooling1D, tf.keras.layers.Conv1D, tf.keras.layers.Flatten)
+
+
+def _state_sizes(cell):
+    state_size = cell.state_size
+    return list(state_size) if isinstance(state_size, (list, tuple)) else [state_size]
+
+
+def check_steppable(model):
+    """Checks that all layers of the model can be evaluated one timestep at a time.
+
+    :param model: Keras Sequential model
+    :raises ValueError: if a layer operates on entire sequences
+    """
+    for layer in model.layers:
+        if isinstance(layer, _SEQUENCE_LAYERS) or getattr(layer, 'go_backwards', False):
+            raise ValueError('Layer {} operates on entire sequences and cannot be stepped'.format(layer.name))
+
+
+def get_initial_states(model, batch_size, dtype=tf.float32):
+    """Creates zero states of all RNN layers of the model.
+
+    :param model: Keras Sequential model
+    :param batch_size: number of sequences processed in parallel
+    :param dtype: data type of the states
+    :return: list with a list of state tensors for every RNN layer
+    """
+    return [[tf.zeros((batch_size, size), dtype=dtype) for size in _state_sizes(layer.cell)]
+            for layer in model.layers if isinstance(layer, tf.keras.layers.RNN)]
+
+
+def step(model, inputs, states):
+    """Evaluates the model for a single timestep.
+
+    :param model: Keras Sequential model
+    :param inputs: Tensor [batch, features] with the input in the current timestep
+    :param states: states from `get_initial_states` or from the previous call of `step`
+    :return: (outputs, new states) tuple
+    """
+    new_states = []
+    x = inputs
+    rnn_index = 0
+    for layer in model.layers:
+        if isinstance(layer, tf.keras.layers.RNN):
+            x, layer_states = layer.cell(x, list(states[rnn_index]))
+            new_states.append(list(tf.nest.flatten(layer_states)))
+            rnn_index += 1
+        else:
+            x = layer(x)
+    return x, new_states
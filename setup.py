@@ -35,7 +35,7 @@ setup(
     # 'Programming Language' classifiers above, 'pip install' will check this
     # and refuse to install the project if the version does not match. See
     # https://packaging.python.org/guides/distributing-packages-using-setuptools/#python-requires
-    python_requires='>=3.4, <4',
+    python_requires='>=3.7, <4',
 
     # https://packaging.python.org/en/latest/requirements.html
     #install_requires=['peppercorn'],  # Optional
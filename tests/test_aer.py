@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from neuroaikit.dataset import aer
+
+WIDTH, HEIGHT = 34, 34
+
+
+def _random_events(n=20000, seed=0):
+    rng = np.random.RandomState(seed)
+    events = np.zeros(n, dtype=aer.EVENT_DTYPE)
+    events['t'] = np.sort(rng.randint(0, 2000000, n)) + 123
+    events['t'][n // 2:] += 5000000
+    events['x'] = rng.randint(0, WIDTH, n)
+    events['y'] = rng.randint(0, HEIGHT, n)
+    events['p'] = rng.randint(0, 2, n)
+    return events
+
+
+def _reference_frames(events, bin_size, downsample, polarity, binary):
+    """Bins the events one by one."""
+    width, height = -(-WIDTH // downsample), -(-HEIGHT // downsample)
+    bins = (events['t'] - events['t'][0]) // bin_size
+    frames = np.zeros((bins[-1] + 1, width * height * (2 if polarity else 1)), dtype=np.int64)
+    for b, x, y, p in zip(bins, events['x'], events['y'], events['p']):
+        feature = (int(y) // downsample) * width + int(x) // downsample
+        if polarity:
+            feature += int(p) * width * height
+        frames[b, feature] += 1
+    return (frames > 0).astype(np.uint8) if binary else frames
+
+
+def _write_atis(path, x, y, p, t):
+    raw = np.zeros((len(t), 5), dtype=np.uint8)
+    raw[:, 0] = x
+    raw[:, 1] = y
+    raw[:, 2] = (p << 7) | (t >> 16)
+    raw[:, 3] = (t >> 8) & 0xFF
+    raw[:, 4] = t & 0xFF
+    raw.tofile(path)
+
+
+@pytest.mark.parametrize('format', ['npy', 'raw'])
+@pytest.mark.parametrize('bin_size,downsample,polarity,binary,chunk_size', [
+    (1000, 1, True, True, 1000),
+    (50000, 2, False, False, 7777),
+    (997, 3, True, True, 1 << 20),
+    (3000, 1, True, False, 50),
+])
+def test_stream_frames_matches_reference(tmp_path, format, bin_size, downsample, polarity, binary, chunk_size):
+    events = _random_events()
+    path = str(tmp_path / 'events.{}'.format(format))
+    if format == 'npy':
+        np.save(path, events)
+    else:
+        events.tofile(path)
+    frames = np.concatenate(list(aer.stream_frames(path, WIDTH, HEIGHT, bin_size, downsample, polarity, binary,
+                                                   format, chunk_size)))
+    np.testing.assert_array_equal(frames, _reference_frames(events, bin_size, downsample, polarity, binary))
+
+
+def test_stream_sequences_pads_last_sequence(tmp_path):
+    events = _random_events()
+    path = str(tmp_path / 'events.npy')
+    np.save(path, events)
+    sequences = list(aer.stream_sequences(path, 300, WIDTH, HEIGHT, 1000, chunk_size=5000))
+    reference = _reference_frames(events, 1000, 1, True, True)
+    frames = np.concatenate(sequences)
+    assert all(s.shape == (300, WIDTH * HEIGHT * 2) for s in sequences)
+    np.testing.assert_array_equal(frames[:len(reference)], reference)
+    assert frames[len(reference):].sum() == 0
+
+
+def test_binner_drops_events_outside_of_sensor():
+    events = np.zeros(6, dtype=aer.EVENT_DTYPE)
+    events['t'] = [0, 5, 10, 10, 12, 15]
+    events['x'] = [1, 40, 2, 3, 34, 4]
+    events['y'] = [1, 1, 80, 3, 2, 33]
+    events['p'] = [0, 0, 1, 2, 0, 1]
+    binner = aer.EventBinner(WIDTH, HEIGHT, 10, binary=False)
+    frames = np.concatenate(list(binner.push(events)) + [binner.flush()])
+    expected = np.zeros((2, WIDTH * HEIGHT * 2), dtype=np.int32)
+    expected[0, 1 * WIDTH + 1] = 1
+    expected[1, WIDTH * HEIGHT + 33 * WIDTH + 4] = 1
+    np.testing.assert_array_equal(frames, expected)
+
+
+def test_read_atis_applies_overflow_markers(tmp_path):
+    events = _random_events(3000)
+    increment = 1 << 13
+    # one overflow marker every 1000 events, the timestamps of the events wrap around after every marker
+    markers = np.arange(1000, len(events), 1000)
+    t = events['t'] % increment
+    x = np.insert(events['x'], markers, 0)
+    y = np.insert(events['y'], markers, 240)
+    p = np.insert(events['p'], markers, 0)
+    t = np.insert(t, markers, 0)
+    _write_atis(str(tmp_path / 'events.bin'), x, y, p, t)
+    expected_t = events['t'] % increment + np.searchsorted(markers, np.arange(len(events)), side='right') * increment
+    got = np.concatenate(list(aer.read_events(str(tmp_path / 'events.bin'), 'atis', chunk_size=777)))
+    np.testing.assert_array_equal(got['t'], expected_t)
+    np.testing.assert_array_equal(got['x'], events['x'])
+    np.testing.assert_array_equal(got['y'], events['y'])
+    np.testing.assert_array_equal(got['p'], events['p'])
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+import tensorflow as tf
+
+import neuroaikit.tf as aitf
+from neuroaikit.tf.layers.compact import spike_matmul, spike_reset, spike_max_reset
+
+
+def _spikes(shape, seed=0):
+    spikes = (np.random.RandomState(seed).rand(*shape) < 0.3).astype(np.float32)
+    spikes[0] = 0.0  # a sample without spikes
+    return tf.constant(spikes)
+
+
+def _value_and_gradients(op, *args):
+    with tf.GradientTape() as tape:
+        tape.watch(args)
+        out = op(*args)
+        loss = tf.reduce_sum(out * tf.reshape(tf.range(tf.size(out), dtype=out.dtype), out.shape))
+    return [out] + tape.gradient(loss, list(args))
+
+
+def _assert_all_close(actual, expected):
+    for a, e in zip(actual, expected):
+        np.testing.assert_allclose(a.numpy(), e.numpy(), rtol=1e-5, atol=1e-5)
+
+
+def test_spike_matmul():
+    spikes, kernel = _spikes((6, 5)), tf.random.normal((5, 4))
+    _assert_all_close(_value_and_gradients(spike_matmul, spikes, kernel),
+                      _value_and_gradients(tf.matmul, spikes, kernel))
+
+
+def test_spike_reset():
+    Vm, spikes = tf.random.normal((6, 5)), _spikes((6, 5))
+    _assert_all_close(_value_and_gradients(spike_reset, Vm, spikes),
+                      _value_and_gradients(lambda v, s: v * (1.0 - s), Vm, spikes))
+
+
+def test_spike_max_reset():
+    Vm, spikes = tf.random.normal((6, 5)), _spikes((6, 5))
+    _assert_all_close(_value_and_gradients(spike_max_reset, Vm, spikes),
+                      _value_and_gradients(lambda v, s: v * (1.0 - tf.reduce_max(s, axis=-1, keepdims=True)),
+                                           Vm, spikes))
+
+
+@pytest.mark.parametrize('kwargs', [{'recurrent': True}, {'recurrent': True, 'lateral_inhibition': True},
+                                    {'recurrent': True, 'recurrent_rank': 4, 'input_rank': 6}])
+def test_compact_spikes_snu(kwargs):
+    x = _spikes((4, 12, 10))
+    y = tf.random.normal((4, 12, 3))
+
+    def build(compact_spikes):
+        return tf.keras.Sequential([
+            tf.keras.layers.InputLayer(input_shape=[None, 10]),
+            aitf.layers.SNU(16, g=aitf.activations.leaky_rel, compact_spikes=compact_spikes, return_sequences=True,
+                            **kwargs),
+            aitf.layers.SNU(8, compact_spikes=compact_spikes, return_sequences=True, **kwargs),
+            tf.keras.layers.Dense(3)])
+
+    results = []
+    reference = build(False)
+    for compact_spikes in [False, True]:
+        model = build(compact_spikes)
+        model.set_weights(reference.get_weights())
+        with tf.GradientTape() as tape:
+            out = model(x)
+            loss = tf.reduce_mean((out - y) ** 2)
+        results.append([out] + tape.gradient(loss, model.trainable_variables))
+    _assert_all_close(results[1], results[0])
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+import tensorflow as tf
+
+import neuroaikit.tf as aitf
+from neuroaikit.tf.layers.snuscan import linear_scan
+
+
+def _sequential_scan(a, b):
+    h, outputs = tf.zeros_like(b[:, 0]), []
+    for t in range(b.shape[1]):
+        h = a[:, t] * h + b[:, t]
+        outputs.append(h)
+    return tf.stack(outputs, axis=1)
+
+
+@pytest.mark.parametrize('timesteps', [1, 2, 37, 64])
+def test_linear_scan_matches_sequential_loop(timesteps):
+    a = tf.random.uniform((2, timesteps, 3), seed=0)
+    b = tf.random.normal((2, timesteps, 3), seed=1)
+    weights = tf.random.normal((2, timesteps, 3), seed=2)
+    results = []
+    for scan in [linear_scan, _sequential_scan]:
+        with tf.GradientTape() as tape:
+            tape.watch([a, b])
+            h = scan(a, b)
+            loss = tf.reduce_sum(h * weights)
+        results.append([h] + tape.gradient(loss, [a, b]))
+    for actual, expected in zip(*results):
+        np.testing.assert_allclose(actual.numpy(), expected.numpy(), rtol=1e-5, atol=1e-5)
+
+
+def test_snuscan_matches_snu_with_full_reset():
+    timesteps = 12
+    x = (np.random.RandomState(0).rand(4, timesteps, 20) < 0.3).astype(np.float32)
+    reference = aitf.layers.SNU(16, return_sequences=True)
+    expected = reference(x).numpy()
+    scan = aitf.layers.SNU(16, parallel_scan=True, reset_iterations=timesteps, return_sequences=True)
+    scan.build(x.shape)
+    scan.set_weights(reference.get_weights())
+    np.testing.assert_array_equal(scan(x).numpy(), expected)
+    assert 0.0 < expected.mean() < 1.0